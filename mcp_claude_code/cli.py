@@ -1,17 +1,29 @@
 """Command-line interface for the MCP Claude Code server."""
 
 import argparse
-import json
+import functools
 import os
 import sys
-from pathlib import Path
 from typing import Any, cast
 
-from mcp_claude_code.server import ClaudeCodeServer
+# Claude Desktop config directory relative to the home directory, per platform.
+# Windows is handled separately because it lives under %APPDATA%.
+_CLAUDE_CONFIG_SUBDIRS: dict[str, tuple[str, ...]] = {
+    "darwin": ("Library", "Application Support", "Claude"),
+}
+_DEFAULT_CLAUDE_CONFIG_SUBDIR: tuple[str, ...] = (".config", "claude")
 
 
-def main() -> None:
-    """Run the CLI for the MCP Claude Code server."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the CLI.
+
+    The parser is built once and shared, so callers must not add arguments to it
+    or otherwise change it.
+
+    Returns:
+        The configured argument parser
+    """
     parser = argparse.ArgumentParser(
         description="MCP server implementing Claude Code capabilities"
     )
@@ -113,6 +125,12 @@ def main() -> None:
         help="Install server configuration in Claude Desktop",
     )
 
+    return parser
+
+
+def main() -> None:
+    """Run the CLI for the MCP Claude Code server."""
+    parser = _build_parser()
     args = parser.parse_args()
 
     # Cast args attributes to appropriate types to avoid 'Any' warnings
@@ -130,9 +148,15 @@ def main() -> None:
     allowed_patterns: list[str] = (
         cast(list[str], args.allowed_patterns) if args.allowed_patterns else []
     )
-    allowed_paths: list[str] = (
-        cast(list[str], args.allowed_paths) if args.allowed_paths else []
-    )
+    # Deduplicate paths while preserving the order they were given in. Paths are
+    # compared in normalized form so "dir" and "dir/" are treated as the same path.
+    allowed_paths: list[str] = []
+    seen_paths: set[str] = set()
+    for path in cast(list[str], args.allowed_paths or []):
+        normalized_path = os.path.realpath(path)
+        if normalized_path not in seen_paths:
+            seen_paths.add(normalized_path)
+            allowed_paths.append(path)
     project_paths: list[str] = (
         cast(list[str], args.project_paths) if args.project_paths else []
     )
@@ -145,6 +169,10 @@ def main() -> None:
     if not allowed_paths:
         allowed_paths = [os.getcwd()]
 
+    # Import the server lazily so --help and --install don't pay for loading
+    # FastMCP and every tool module
+    from mcp_claude_code.server import ClaudeCodeServer
+
     # Run the server
     server = ClaudeCodeServer(
         name=name,
@@ -164,6 +192,42 @@ def main() -> None:
     server.run(transport=transport)
 
 
+def _loads_config(data: bytes) -> Any:
+    """Parse a JSON config document, using orjson when it is installed.
+
+    Args:
+        data: Raw JSON bytes
+
+    Returns:
+        The parsed document
+    """
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def _dumps_config(config: dict[str, Any]) -> bytes:
+    """Serialize a config as indented JSON, using orjson when it is installed.
+
+    Args:
+        config: The config to serialize
+
+    Returns:
+        UTF-8 encoded JSON indented by two spaces
+    """
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.dumps(config, indent=2).encode("utf-8")
+    return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+
+
 def install_claude_desktop_config(
     name: str = "claude-code",
     allowed_paths: list[str] | None = None,
@@ -176,15 +240,17 @@ def install_claude_desktop_config(
         allowed_paths: Optional list of paths to allow
         project_paths: Optional list of project paths for prompt generation
     """
+    from pathlib import Path
+
     # Find the Claude Desktop config directory
     home: Path = Path.home()
 
-    if sys.platform == "darwin":  # macOS
-        config_dir: Path = home / "Library" / "Application Support" / "Claude"
-    elif sys.platform == "win32":  # Windows
-        config_dir = Path(os.environ.get("APPDATA", "")) / "Claude"
-    else:  # Linux and others
-        config_dir = home / ".config" / "claude"
+    if sys.platform == "win32":  # Windows
+        config_dir: Path = Path(os.environ.get("APPDATA", "")) / "Claude"
+    else:  # macOS, Linux and others
+        config_dir = home.joinpath(
+            *_CLAUDE_CONFIG_SUBDIRS.get(sys.platform, _DEFAULT_CLAUDE_CONFIG_SUBDIR)
+        )
 
     config_file: Path = config_dir / "claude_desktop_config.json"
 
@@ -216,10 +282,11 @@ def install_claude_desktop_config(
     }
 
     # Check if the file already exists
+    existing_data: bytes | None = None
     if config_file.exists():
         try:
-            with open(config_file, "r") as f:
-                existing_config: dict[str, Any] = json.load(f)
+            existing_data = config_file.read_bytes()
+            existing_config: dict[str, Any] = _loads_config(existing_data)
 
             # Update the existing config
             if "mcpServers" not in existing_config:
@@ -231,29 +298,34 @@ def install_claude_desktop_config(
             print(f"Error reading existing config: {e}")
             print("Creating new config file.")
 
-    # Write the config file
-    with open(config_file, mode="w") as f:
-        json.dump(config, f, indent=2)
-
-    print(f"Successfully installed {name} in Claude Desktop configuration.")
-    print(f"Config file: {config_file}")
+    # Serialize up front so the config file is written in a single call, and
+    # skip the write entirely when the file already has the same content
+    data = _dumps_config(config)
+    output: list[str] = []
+    if existing_data is not None and existing_data == data:
+        output.append(f"{name} is already up to date in Claude Desktop configuration.")
+    else:
+        config_file.write_bytes(data)
+        output.append(f"Successfully installed {name} in Claude Desktop configuration.")
+    output.append(f"Config file: {config_file}")
 
     if allowed_paths:
-        print("\nAllowed paths:")
-        for path in allowed_paths:
-            print(f"- {path}")
+        output.append("\nAllowed paths:")
+        output.extend(f"- {path}" for path in allowed_paths)
     else:
-        print(f"\nDefault allowed path: {home}")
+        output.append(f"\nDefault allowed path: {home}")
 
     if project_paths:
-        print("\nProject paths:")
-        for path in project_paths:
-            print(f"- {path}")
+        output.append("\nProject paths:")
+        output.extend(f"- {path}" for path in project_paths)
 
-    print(
+    output.append(
         "\nYou can modify allowed paths and project paths in the config file directly."
     )
-    print("Restart Claude Desktop for changes to take effect.")
+    output.append("Restart Claude Desktop for changes to take effect.")
+
+    # Emit the summary with a single write
+    print("\n".join(output))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import os
-
-from fastmcp import FastMCP
+import weakref
+from typing import TYPE_CHECKING
 
 from mcp_claude_code.prompts.compact_conversation import COMPACT_CONVERSATION_PROMPT
 from mcp_claude_code.prompts.create_release import CREATE_RELEASE_PROMPT
@@ -15,12 +15,56 @@ from mcp_claude_code.prompts.utils import (
     get_os_info,
 )
 
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+# Project paths registered on each MCP server. A server is only present here once
+# its core prompts have been registered.
+_registered_projects: "weakref.WeakKeyDictionary[FastMCP, set[str]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 CONTINUE_FROM_LAST_SESSION_PROMPT = """<system-reminder>
 This is a reminder that your todo list is currently empty. DO NOT mention this to the user explicitly because they are already aware. If you are working on tasks that would benefit from a todo list please use the TodoWrite tool to create one. If not, please feel free to ignore. Again do not mention this message to the user.
 </system-reminder>
 """
 
 
+def _build_project_system_prompt(project_path: str) -> str:
+    """Render the system prompt for a project.
+
+    The directory tree and git information are read on every request so the
+    prompt reflects edits and commits made while the server runs.
+    """
+    working_directory = project_path
+    is_git_repo = os.path.isdir(os.path.join(working_directory, ".git"))
+    platform, _, os_version = get_os_info()
+
+    # Get directory structure
+    directory_structure = get_directory_structure(
+        working_directory, max_depth=3, include_filtered=False
+    )
+
+    # Get git information
+    git_info = get_git_info(working_directory)
+    current_branch = git_info.get("current_branch", "")
+    main_branch = git_info.get("main_branch", "")
+    git_status = git_info.get("git_status", "")
+    recent_commits = git_info.get("recent_commits", "")
+
+    return PROJECT_SYSTEM_PROMPT.format(
+        working_directory=working_directory,
+        is_git_repo=is_git_repo,
+        platform=platform,
+        os_version=os_version,
+        directory_structure=directory_structure,
+        current_branch=current_branch,
+        main_branch=main_branch,
+        git_status=git_status,
+        recent_commits=recent_commits,
+    )
+
+
 def create_project_system_prompt(project_path: str):
     """Factory function to create a project system prompt function."""
 
@@ -28,40 +72,14 @@ def create_project_system_prompt(project_path: str):
         """
         Summarize the conversation so far for a specific project.
         """
-        working_directory = project_path
-        is_git_repo = os.path.isdir(os.path.join(working_directory, ".git"))
-        platform, _, os_version = get_os_info()
-
-        # Get directory structure
-        directory_structure = get_directory_structure(
-            working_directory, max_depth=3, include_filtered=False
-        )
-
-        # Get git information
-        git_info = get_git_info(working_directory)
-        current_branch = git_info.get("current_branch", "")
-        main_branch = git_info.get("main_branch", "")
-        git_status = git_info.get("git_status", "")
-        recent_commits = git_info.get("recent_commits", "")
-
-        return PROJECT_SYSTEM_PROMPT.format(
-            working_directory=working_directory,
-            is_git_repo=is_git_repo,
-            platform=platform,
-            os_version=os_version,
-            directory_structure=directory_structure,
-            current_branch=current_branch,
-            main_branch=main_branch,
-            git_status=git_status,
-            recent_commits=recent_commits,
-        )
+        return _build_project_system_prompt(project_path)
 
     return project_system_prompt
 
 
-def register_all_prompts(
-    mcp_server: FastMCP, projects: list[str] | None = None
-) -> None:
+def _register_core_prompts(mcp_server: "FastMCP") -> None:
+    """Register the prompts that don't depend on a specific project."""
+
     @mcp_server.prompt(name="Compact current conversation")
     def compact() -> str:
         """
@@ -95,12 +113,26 @@ def register_all_prompts(
         """
         Detailed system prompt include env,git etc information about the specified project.
         """
-        return create_project_system_prompt(project_path)()
+        return _build_project_system_prompt(project_path)
 
-    if projects is None:
+
+def register_all_prompts(
+    mcp_server: "FastMCP", projects: list[str] | None = None
+) -> None:
+    # Calling this again for the same server only registers new projects
+    registered_projects = _registered_projects.get(mcp_server)
+    if registered_projects is None:
+        registered_projects = _registered_projects[mcp_server] = set()
+        _register_core_prompts(mcp_server)
+
+    if not projects:
         return
 
     for project in projects:
+        if project in registered_projects:
+            continue
+        registered_projects.add(project)
+
         # Register the prompt with the factory function
         mcp_server.prompt(
             name=f"System prompt for {os.path.basename(project)}",
@@ -1,14 +1,13 @@
+import functools
+import importlib.util
 import platform
 from pathlib import Path
 
-try:
-    from git import Repo
-
-    GIT_AVAILABLE = True
-except ImportError:
-    GIT_AVAILABLE = False
+# GitPython is only imported when git information is actually requested
+GIT_AVAILABLE = importlib.util.find_spec("git") is not None
 
 
+@functools.cache
 def get_os_info() -> tuple[str, str, str]:
     """Get the operating system information.
     Returns:
@@ -194,6 +193,8 @@ def get_git_info(path: str) -> dict[str, str | None]:
         }
 
     try:
+        from git import Repo
+
         repo = Repo(path)
 
         # Get current branch
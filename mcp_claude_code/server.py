@@ -57,9 +57,8 @@ class ClaudeCodeServer:
         self.permission_manager = PermissionManager()
 
         # Add allowed paths
-        if allowed_paths:
-            for path in allowed_paths:
-                self.permission_manager.add_allowed_path(path)
+        self._registered_paths: set[str] = set()
+        self._add_allowed_paths(allowed_paths)
 
         # Handle allowed patterns (override default exclusions)
         if allowed_patterns:
@@ -99,6 +98,21 @@ class ClaudeCodeServer:
 
         register_all_prompts(mcp_server=self.mcp, projects=self.project_paths)
 
+    def _add_allowed_paths(self, allowed_paths: list[str] | None) -> None:
+        """Register allowed paths with the permission manager.
+
+        Paths that have already been registered are skipped, so passing the same
+        paths to both the constructor and run() does no redundant work.
+
+        Args:
+            allowed_paths: list of paths that the server is allowed to access
+        """
+        for path in allowed_paths or []:
+            if path in self._registered_paths:
+                continue
+            self.permission_manager.add_allowed_path(path)
+            self._registered_paths.add(path)
+
     def _setup_cleanup_handlers(self) -> None:
         """Set up signal handlers and background cleanup thread."""
         if self._cleanup_registered:
@@ -155,9 +169,7 @@ class ClaudeCodeServer:
             allowed_paths: list of paths that the server is allowed to access
         """
         # Add allowed paths if provided
-        allowed_paths_list = allowed_paths or []
-        for path in allowed_paths_list:
-            self.permission_manager.add_allowed_path(path)
+        self._add_allowed_paths(allowed_paths)
 
         # Set up cleanup handlers before running
         self._setup_cleanup_handlers()
@@ -6,7 +6,6 @@ enabling concurrent execution of multiple operations and specialized processing.
 
 from fastmcp import FastMCP
 
-from mcp_claude_code.tools.agent.agent_tool import AgentTool
 from mcp_claude_code.tools.common.base import BaseTool, ToolRegistry
 
 from mcp_claude_code.tools.common.permissions import PermissionManager
@@ -38,6 +37,9 @@ def register_agent_tools(
     Returns:
         List of registered tools
     """
+    # Import lazily so LiteLLM is only loaded when the agent tool is enabled
+    from mcp_claude_code.tools.agent.agent_tool import AgentTool
+
     # Create agent tool
     agent_tool = AgentTool(
         permission_manager=permission_manager,
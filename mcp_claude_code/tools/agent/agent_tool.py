@@ -157,7 +157,7 @@ Usage notes:
         Returns:
             Tool execution result
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Create tool context
         tool_ctx = create_tool_context(ctx)
@@ -185,7 +185,7 @@ The agent cannot access files without knowing their absolute locations."""
         result = await self._execute_agent(prompt, tool_ctx)
 
         # Calculate execution time
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
 
         # Format the result
         formatted_result = self._format_result(result, execution_time)
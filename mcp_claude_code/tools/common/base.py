@@ -10,6 +10,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Awaitable
 from typing import Any, Callable, final
 
+from anyio import ClosedResourceError
 from fastmcp import FastMCP
 from fastmcp import Context as MCPContext
 
@@ -20,6 +21,13 @@ from mcp_claude_code.tools.common.validation import (
     validate_path_parameter,
 )
 
+# Exceptions raised when the client disconnects mid-operation. Types are matched
+# exactly, so other ConnectionError subclasses such as ConnectionRefusedError from
+# a tool's own network calls still propagate.
+_CONNECTION_ERRORS: frozenset[type[BaseException]] = frozenset(
+    {ClosedResourceError, ConnectionError, BrokenPipeError}
+)
+
 
 def handle_connection_errors(
     func: Callable[..., Awaitable[str]],
@@ -40,23 +48,13 @@ def handle_connection_errors(
     async def wrapper(*args: Any, **kwargs: Any) -> str:
         try:
             return await func(*args, **kwargs)
-        except Exception as e:
-            # Check if this is a connection-related error
-            error_name = type(e).__name__
-            if any(
-                name in error_name
-                for name in [
-                    "ClosedResourceError",
-                    "ConnectionError",
-                    "BrokenPipeError",
-                ]
-            ):
-                # Client has disconnected - log the error but don't crash
-                # Return a simple error message (though it likely won't be received)
-                return f"Client disconnected during operation: {error_name}"
-            else:
+        except (ClosedResourceError, ConnectionError) as e:
+            if type(e) not in _CONNECTION_ERRORS:
                 # Re-raise non-connection errors
                 raise
+            # Client has disconnected - log the error but don't crash
+            # Return a simple error message (though it likely won't be received)
+            return f"Client disconnected during operation: {type(e).__name__}"
 
     return wrapper
 
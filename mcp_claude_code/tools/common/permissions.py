@@ -135,13 +135,15 @@ class PermissionManager:
         if self._is_path_excluded(resolved_path):
             return False
 
-        # Check if the path is within any allowed path
+        # Check if the path is within any allowed path, comparing strings rather
+        # than raising and catching ValueError from relative_to for each miss
+        path_str = os.path.normcase(resolved_path)
         for allowed_path in self.allowed_paths:
-            try:
-                resolved_path.relative_to(allowed_path)
+            allowed_str = os.path.normcase(allowed_path)
+            if path_str == allowed_str or path_str.startswith(
+                allowed_str.rstrip(os.sep) + os.sep
+            ):
                 return True
-            except ValueError:
-                continue
 
         return False
 
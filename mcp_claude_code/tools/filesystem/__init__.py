@@ -4,19 +4,56 @@ This package provides tools for interacting with the filesystem, including readi
 and editing files, directory navigation, and content searching.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from fastmcp import FastMCP
 
 from mcp_claude_code.tools.common.base import BaseTool, ToolRegistry
 
 from mcp_claude_code.tools.common.permissions import PermissionManager
-from mcp_claude_code.tools.filesystem.content_replace import ContentReplaceTool
-from mcp_claude_code.tools.filesystem.directory_tree import DirectoryTreeTool
-from mcp_claude_code.tools.filesystem.edit import Edit
-from mcp_claude_code.tools.filesystem.grep import Grep
-from mcp_claude_code.tools.filesystem.grep_ast_tool import GrepAstTool
-from mcp_claude_code.tools.filesystem.multi_edit import MultiEdit
-from mcp_claude_code.tools.filesystem.read import ReadTool
-from mcp_claude_code.tools.filesystem.write import Write
+
+if TYPE_CHECKING:
+    from mcp_claude_code.tools.filesystem.content_replace import ContentReplaceTool
+    from mcp_claude_code.tools.filesystem.directory_tree import DirectoryTreeTool
+    from mcp_claude_code.tools.filesystem.edit import Edit
+    from mcp_claude_code.tools.filesystem.grep import Grep
+    from mcp_claude_code.tools.filesystem.grep_ast_tool import GrepAstTool
+    from mcp_claude_code.tools.filesystem.multi_edit import MultiEdit
+    from mcp_claude_code.tools.filesystem.read import ReadTool
+    from mcp_claude_code.tools.filesystem.write import Write
+
+# Tool classes are imported on first use so that importing the package, e.g. for
+# the read-only tools, does not load every tool module and its dependencies
+_TOOL_MODULES: dict[str, str] = {
+    "ContentReplaceTool": "content_replace",
+    "DirectoryTreeTool": "directory_tree",
+    "Edit": "edit",
+    "Grep": "grep",
+    "GrepAstTool": "grep_ast_tool",
+    "MultiEdit": "multi_edit",
+    "ReadTool": "read",
+    "Write": "write",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import tool classes lazily on first attribute access.
+
+    Args:
+        name: Attribute name
+
+    Returns:
+        The requested tool class
+    """
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
 
 # Export all tool classes
 __all__ = [
@@ -44,6 +81,11 @@ def get_read_only_filesystem_tools(
     Returns:
         List of read-only filesystem tool instances
     """
+    from mcp_claude_code.tools.filesystem.directory_tree import DirectoryTreeTool
+    from mcp_claude_code.tools.filesystem.grep import Grep
+    from mcp_claude_code.tools.filesystem.grep_ast_tool import GrepAstTool
+    from mcp_claude_code.tools.filesystem.read import ReadTool
+
     return [
         ReadTool(permission_manager),
         DirectoryTreeTool(permission_manager),
@@ -61,6 +103,15 @@ def get_filesystem_tools(permission_manager: PermissionManager) -> list[BaseTool
     Returns:
         List of filesystem tool instances
     """
+    from mcp_claude_code.tools.filesystem.content_replace import ContentReplaceTool
+    from mcp_claude_code.tools.filesystem.directory_tree import DirectoryTreeTool
+    from mcp_claude_code.tools.filesystem.edit import Edit
+    from mcp_claude_code.tools.filesystem.grep import Grep
+    from mcp_claude_code.tools.filesystem.grep_ast_tool import GrepAstTool
+    from mcp_claude_code.tools.filesystem.multi_edit import MultiEdit
+    from mcp_claude_code.tools.filesystem.read import ReadTool
+    from mcp_claude_code.tools.filesystem.write import Write
+
     return [
         ReadTool(permission_manager),
         Write(permission_manager),
@@ -4,7 +4,12 @@ This module provides common functionality for filesystem tools including path ha
 error formatting, and shared utilities for file operations.
 """
 
+import fnmatch
+import os
+import re
 from abc import ABC
+from collections.abc import Callable, Iterator
+from difflib import unified_diff
 from pathlib import Path
 from typing import Any
 
@@ -13,6 +18,156 @@ from fastmcp import Context as MCPContext
 from mcp_claude_code.tools.common.base import FileSystemTool
 from mcp_claude_code.tools.common.context import ToolContext, create_tool_context
 
+# Brace-expanded extension list such as "*.{ts,tsx}"
+_EXTENSION_LIST = re.compile(r"\*\.\{([^{}*?\[\],]+(?:,[^{}*?\[\],]+)*)\}")
+
+
+def name_matcher(file_pattern: str) -> Callable[[str], bool]:
+    """Build a file name predicate for a shell-style pattern.
+
+    Patterns follow fnmatch.fnmatch, and extension lists such as "*.{ts,tsx}"
+    are also accepted, as in ripgrep's globs. The pattern is translated once
+    instead of on every call, and plain suffix patterns such as "*.py" become
+    a str.endswith check.
+
+    Args:
+        file_pattern: Shell-style file name pattern
+
+    Returns:
+        Function returning True for file names that match the pattern
+    """
+    pattern = os.path.normcase(file_pattern)
+    if pattern == "*":
+        return lambda name: True
+
+    suffix = pattern[1:]
+    if pattern.startswith("*") and not any(c in suffix for c in "*?[{"):
+        return lambda name: os.path.normcase(name).endswith(suffix)
+
+    extensions = _EXTENSION_LIST.fullmatch(pattern)
+    if extensions:
+        suffixes = tuple(f".{ext}" for ext in extensions.group(1).split(","))
+        return lambda name: os.path.normcase(name).endswith(suffixes)
+
+    match = re.compile(fnmatch.translate(pattern)).match
+    return lambda name: match(os.path.normcase(name)) is not None
+
+
+def scandir_recursive(
+    path: str, descend: Callable[[os.DirEntry[str]], bool] | None = None
+) -> Iterator[os.DirEntry[str]]:
+    """Recursively yield the entries below a directory.
+
+    Uses os.scandir so file type checks come from the cached directory entry
+    instead of extra stat calls. Symlinked directories are not descended into and
+    unreadable directories are skipped.
+
+    Args:
+        path: Directory to walk
+        descend: Optional predicate; directories it rejects are yielded but their
+            contents are not walked
+
+    Yields:
+        Directory entries for every file and directory below path
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                yield entry
+                if entry.is_dir(follow_symlinks=False) and (
+                    descend is None or descend(entry)
+                ):
+                    yield from scandir_recursive(entry.path, descend)
+    except OSError:
+        return
+
+
+# Number of context lines shown around each change in the diff
+_DIFF_CONTEXT = 3
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@$")
+
+
+def windowed_diff(
+    original: str, modified: str, start: int, end: int, file_path: str
+) -> str:
+    """Generate a unified diff covering only the lines around an edited region.
+
+    Only the lines from the first to the last replaced character, plus context,
+    are split and compared, so a small edit to a large file does not split and
+    diff the whole file. Hunk headers are shifted to absolute line numbers.
+
+    Args:
+        original: Original file content
+        modified: Modified file content, identical to original outside the region
+        start: Offset of the first replaced character in original
+        end: Offset just past the last replaced character in original
+        file_path: Path shown in the diff headers
+
+    Returns:
+        Unified diff text, empty if nothing changed
+    """
+    # Extend the region to whole lines plus context lines on each side
+    window_start = original.rfind("\n", 0, start) + 1
+    for _ in range(_DIFF_CONTEXT):
+        if window_start == 0:
+            break
+        window_start = original.rfind("\n", 0, window_start - 1) + 1
+    window_end = end
+    for _ in range(_DIFF_CONTEXT + 1):
+        newline = original.find("\n", window_end)
+        if newline == -1:
+            window_end = len(original)
+            break
+        window_end = newline + 1
+
+    # Text after the region is unchanged, so the modified window ends at the
+    # same distance from the end of the content
+    modified_end = window_end + len(modified) - len(original)
+    line_offset = original.count("\n", 0, window_start)
+
+    diff_lines = unified_diff(
+        original[window_start:window_end].splitlines(keepends=True),
+        modified[window_start:modified_end].splitlines(keepends=True),
+        fromfile=f"{file_path} (original)",
+        tofile=f"{file_path} (modified)",
+        n=_DIFF_CONTEXT,
+    )
+
+    def shift_header(line: str) -> str:
+        match = _HUNK_HEADER.match(line) if line_offset else None
+        if match is None:
+            return line
+        old_start, old_len, new_start, new_len = match.groups()
+        return (
+            f"@@ -{int(old_start) + line_offset}{old_len or ''} "
+            f"+{int(new_start) + line_offset}{new_len or ''} @@\n"
+        )
+
+    return "".join(shift_header(line) for line in diff_lines)
+
+
+# Line separator that text-mode writes put in place of "\n"
+_LINE_SEPARATOR = os.linesep.encode("ascii")
+
+
+def platform_newlines(data: bytes | memoryview) -> bytes | memoryview:
+    """Translate the newlines in encoded text to the platform line separator.
+
+    Files written by the filesystem tools end lines with os.linesep, as a
+    text-mode write would.
+
+    Args:
+        data: UTF-8 encoded text with "\\n" line endings
+
+    Returns:
+        The text with each "\\n" replaced by os.linesep; data itself where the
+        separator is already "\\n"
+    """
+    if _LINE_SEPARATOR == b"\n":
+        return data
+    return bytes(data).replace(b"\n", _LINE_SEPARATOR)
+
 
 class FilesystemBaseTool(FileSystemTool, ABC):
     """Enhanced base class for all filesystem tools.
@@ -100,6 +255,20 @@ class FilesystemBaseTool(FileSystemTool, ABC):
             return False, f"{error_prefix}: {message}"
         return True, ""
 
+    def write_text_file(self, path: Path, content: str) -> None:
+        """Write text to a file as UTF-8 in a single write call.
+
+        The content is encoded once and written in binary mode, skipping the
+        chunked encoding of a text-mode file. Newlines are translated to the
+        platform separator, as a text-mode write would do.
+
+        Args:
+            path: File to write
+            content: Text content to write
+        """
+        with open(path, "wb") as f:
+            f.write(platform_newlines(content.encode("utf-8")))
+
     def create_tool_context(self, ctx: MCPContext) -> ToolContext:
         """Create a tool context with the tool name.
 
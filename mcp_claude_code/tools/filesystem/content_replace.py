@@ -3,16 +3,27 @@
 This module provides the ContentReplaceTool for replacing text patterns in files.
 """
 
-import fnmatch
+import codecs
+import mmap
+import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Annotated, TypedDict, Unpack, final, override
+from typing import Annotated, BinaryIO, TypedDict, Unpack, final, override
 
+import anyio
+from anyio import to_thread
 from fastmcp import Context as MCPContext
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_context
 from pydantic import Field
 
-from mcp_claude_code.tools.filesystem.base import FilesystemBaseTool
+from mcp_claude_code.tools.filesystem.base import (
+    FilesystemBaseTool,
+    name_matcher,
+    platform_newlines,
+    scandir_recursive,
+)
 
 Pattern = Annotated[
     str,
@@ -54,6 +65,233 @@ DryRun = Annotated[
 ]
 
 
+# Number of leading bytes checked for binary content before reading a whole file
+_SNIFF_SIZE = 8192
+
+# Files at least this large are memory-mapped and streamed instead of read whole
+_MMAP_THRESHOLD = 64 * 1024 * 1024
+
+# Chunk size used to stream memory-mapped files
+_MMAP_CHUNK_SIZE = 1024 * 1024
+
+# File replacement is I/O bound, so use more threads than cores
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _read_text_bytes(f: BinaryIO) -> bytes | None:
+    """Read the rest of a file, checking that it is UTF-8 text.
+
+    The start of the file is sniffed first so binary files are rejected without
+    reading and decoding them in full.
+
+    Args:
+        f: File opened in binary mode
+
+    Returns:
+        The file content, or None for binary files
+    """
+    head = f.read(_SNIFF_SIZE)
+    if b"\0" in head:
+        return None
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        decoder.decode(head)
+        rest = f.read()
+        decoder.decode(rest, final=True)
+    except UnicodeDecodeError:
+        return None
+    return head + rest if rest else head
+
+
+def _stream_mapped_file(
+    mm: mmap.mmap, pattern: bytes, replacement: bytes, out: BinaryIO | None = None
+) -> int | None:
+    """Replace all occurrences of a pattern in a memory-mapped file, in chunks.
+
+    Newlines are translated to "\\n" as the chunks are read, as text-mode reads
+    do. The last len(pattern) - 1 bytes of each chunk are carried into the next
+    one so matches spanning a chunk boundary are found. Only one chunk is held in
+    memory at a time, whatever the file size or number of matches.
+
+    Without an output file the chunks are also checked to be UTF-8 text and the
+    occurrences are only counted. With one, the translated text is written with
+    each occurrence replaced.
+
+    Args:
+        mm: Read-only memory map of the file
+        pattern: UTF-8 encoded text pattern to search for
+        replacement: UTF-8 encoded text to replace the pattern with
+        out: File opened in binary mode to write the result to, if any
+
+    Returns:
+        Number of occurrences found, or None for binary files
+    """
+    if b"\0" in mm[:_SNIFF_SIZE]:
+        return None
+    decoder = codecs.getincrementaldecoder("utf-8")() if out is None else None
+
+    # Newlines are written the same way as for files rewritten in memory
+    replacement = platform_newlines(replacement)
+    keep = len(pattern) - 1
+    count = 0
+
+    def scan(buffer: bytes, final: bool) -> bytes:
+        """Handle the matches in buffer and return the bytes left to carry."""
+        nonlocal count
+        # A match starting before limit lies entirely within buffer
+        limit = len(buffer) if final else len(buffer) - keep
+        pos = 0
+        hit = buffer.find(pattern)
+        while hit != -1 and hit < limit:
+            count += 1
+            if out is not None:
+                out.write(platform_newlines(buffer[pos:hit]))
+                out.write(replacement)
+            pos = hit + len(pattern)
+            hit = buffer.find(pattern, pos)
+        carry_start = max(pos, limit)
+        if out is not None:
+            out.write(platform_newlines(buffer[pos:carry_start]))
+        return buffer[carry_start:]
+
+    carry = b""
+    pending_cr = False
+    for start in range(0, len(mm), _MMAP_CHUNK_SIZE):
+        chunk = mm[start : start + _MMAP_CHUNK_SIZE]
+        if decoder is not None:
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError:
+                return None
+
+        # Hold back a trailing "\r" in case the next chunk starts with "\n"
+        if pending_cr:
+            chunk = b"\r" + chunk
+        pending_cr = chunk.endswith(b"\r")
+        if pending_cr:
+            chunk = chunk[:-1]
+        if b"\r" in chunk:
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+        carry = scan(carry + chunk, final=False)
+
+    if decoder is not None:
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return None
+
+    scan(carry + b"\n" if pending_cr else carry, final=True)
+    return count
+
+
+def _write_mapped_file(
+    file_path: str, mm: mmap.mmap, pattern: bytes, replacement: bytes
+) -> str:
+    """Write a memory-mapped file with a pattern replaced to a temporary file.
+
+    The temporary file is created next to the file's real target and is given
+    the target's mode and, where permitted, its owner.
+
+    Args:
+        file_path: File being processed
+        mm: Read-only memory map of the file
+        pattern: UTF-8 encoded text pattern to search for
+        replacement: UTF-8 encoded text to replace the pattern with
+
+    Returns:
+        Path of the temporary file
+    """
+    target = os.path.realpath(file_path)
+    directory, name = os.path.split(target)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            _stream_mapped_file(mm, pattern, replacement, out)
+            out.flush()
+            os.fsync(out.fileno())
+
+        # Copy the mode and owner only. copystat would also copy the old
+        # modification time, hiding the edit from mtime-based caches.
+        shutil.copymode(target, tmp_path)
+        st = os.stat(target)
+        try:
+            os.chown(tmp_path, st.st_uid, st.st_gid)
+        except (AttributeError, OSError):
+            pass
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def _replace_in_file(
+    file_path: str, pattern: bytes, replacement: bytes, dry_run: bool
+) -> int:
+    """Replace all occurrences of a pattern in a single file.
+
+    The file is searched and rewritten as UTF-8 bytes. UTF-8 is self-synchronizing,
+    so a byte match of an encoded pattern is always a match of the text pattern.
+
+    Args:
+        file_path: File to process
+        pattern: UTF-8 encoded text pattern to search for
+        replacement: UTF-8 encoded text to replace the pattern with
+        dry_run: If True, count occurrences without modifying the file
+
+    Returns:
+        Number of occurrences found, 0 for binary files
+    """
+    tmp_path: str | None = None
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        # A file smaller than the pattern cannot contain it
+        if size < len(pattern):
+            return 0
+
+        # Very large files are memory-mapped and streamed: one pass checks and
+        # counts, and a second writes the result only if there is one to write
+        if size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                count = _stream_mapped_file(mm, pattern, replacement)
+                if not count or dry_run:
+                    return count or 0
+                tmp_path = _write_mapped_file(file_path, mm, pattern, replacement)
+            data = None
+        else:
+            data = _read_text_bytes(f)
+
+    if tmp_path is not None:
+        # Swap the complete result in atomically, so a failure at any point
+        # leaves the original file intact. The real target is replaced so
+        # symlinks are kept.
+        try:
+            os.replace(tmp_path, os.path.realpath(file_path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return count
+
+    if data is None:
+        # Skip binary files
+        return 0
+
+    # Match text-mode reads, which translate all newlines to "\n"
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+    # Count occurrences
+    count = data.count(pattern)
+
+    # Write file if not a dry run
+    if count > 0 and not dry_run:
+        with open(file_path, "wb") as f:
+            f.write(platform_newlines(data.replace(pattern, replacement)))
+
+    return count
+
+
 class ContentReplaceToolParams(TypedDict):
     """Parameters for the ContentReplaceTool.
 
@@ -130,6 +368,10 @@ Only works within allowed directories."""
             await tool_ctx.error(path_validation.error_message)
             return f"Error: {path_validation.error_message}"
 
+        if not pattern:
+            await tool_ctx.error("Parameter 'pattern' cannot be empty")
+            return "Error: Parameter 'pattern' cannot be empty"
+
         # file_pattern and dry_run can be None safely as they have default values
 
         await tool_ctx.info(
@@ -155,15 +397,16 @@ Only works within allowed directories."""
                 return error_msg
 
             # Find matching files
-            matching_files: list[Path] = []
+            matching_files: list[str] = []
+
+            # Compile the file pattern once; both branches below use it
+            name_matches = name_matcher(file_pattern)
 
             # Process based on whether path is a file or directory
             if input_path.is_file():
                 # Single file search
-                if file_pattern == "*" or fnmatch.fnmatch(
-                    input_path.name, file_pattern
-                ):
-                    matching_files.append(input_path)
+                if name_matches(input_path.name):
+                    matching_files.append(str(input_path))
                     await tool_ctx.info(f"Searching single file: {path}")
                 else:
                     await tool_ctx.info(
@@ -174,23 +417,19 @@ Only works within allowed directories."""
                 # Directory search - optimized file finding
                 await tool_ctx.info(f"Finding files in directory: {path}")
 
-                # Keep track of allowed paths for filtering
-                allowed_paths: set[str] = set()
-
-                # Collect all allowed paths first for faster filtering
-                for entry in input_path.rglob("*"):
-                    entry_path = str(entry)
-                    if self.is_path_allowed(entry_path):
-                        allowed_paths.add(entry_path)
-
-                # Find matching files efficiently
-                for entry in input_path.rglob("*"):
-                    entry_path = str(entry)
-                    if entry_path in allowed_paths and entry.is_file():
-                        if file_pattern == "*" or fnmatch.fnmatch(
-                            entry.name, file_pattern
-                        ):
-                            matching_files.append(entry)
+                # Walk the tree once, checking the cheap name match before
+                # the permission check, which resolves the path
+                for entry in scandir_recursive(path):
+                    try:
+                        is_file = entry.is_file()
+                    except OSError:
+                        continue
+                    if (
+                        is_file
+                        and name_matches(entry.name)
+                        and self.is_path_allowed(entry.path)
+                    ):
+                        matching_files.append(entry.path)
 
                 await tool_ctx.info(f"Found {len(matching_files)} matching files")
             else:
@@ -207,38 +446,55 @@ Only works within allowed directories."""
             files_modified = 0
             replacements_made = 0
 
-            for i, file_path in enumerate(matching_files):
-                # Report progress every 10 files
-                if i % 10 == 0:
-                    await tool_ctx.report_progress(i, total_files)
+            # Encode once; files are searched and rewritten as bytes
+            pattern_bytes = pattern.encode("utf-8")
+            replacement_bytes = replacement.encode("utf-8")
+
+            # Read and rewrite files on anyio's worker threads, at most
+            # _MAX_WORKERS at a time. Outcomes are stored by index so the
+            # report lists files in the order they were found.
+            limiter = anyio.CapacityLimiter(_MAX_WORKERS)
 
+            # Report progress about every 5% of files rather than every 10 files
+            progress_step = max(10, total_files // 20)
+            outcomes: list[int | Exception] = [0] * total_files
+            completed = 0
+
+            async def process_file(index: int, file_path: str) -> None:
+                nonlocal completed
                 try:
-                    # Read file
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-
-                    # Count occurrences
-                    count = content.count(pattern)
-
-                    if count > 0:
-                        # Replace pattern
-                        new_content = content.replace(pattern, replacement)
-
-                        # Add to results
-                        replacements_made += count
-                        files_modified += 1
-                        results.append(f"{file_path}: {count} replacements")
-
-                        # Write file if not a dry run
-                        if not dry_run:
-                            with open(file_path, "w", encoding="utf-8") as f:
-                                f.write(new_content)
-
-                except UnicodeDecodeError:
-                    # Skip binary files
-                    continue
+                    outcomes[index] = await to_thread.run_sync(
+                        _replace_in_file,
+                        file_path,
+                        pattern_bytes,
+                        replacement_bytes,
+                        dry_run,
+                        limiter=limiter,
+                    )
                 except Exception as e:
-                    await tool_ctx.warning(f"Error processing {file_path}: {str(e)}")
+                    outcomes[index] = e
+
+                completed += 1
+                if completed % progress_step == 0:
+                    await tool_ctx.report_progress(completed, total_files)
+
+            async with anyio.create_task_group() as task_group:
+                for index, file_path in enumerate(matching_files):
+                    task_group.start_soon(process_file, index, file_path)
+
+            errors: list[str] = []
+            for file_path, outcome in zip(matching_files, outcomes):
+                if isinstance(outcome, Exception):
+                    errors.append(f"Error processing {file_path}: {str(outcome)}")
+                elif outcome > 0:
+                    # Add to results
+                    replacements_made += outcome
+                    files_modified += 1
+                    results.append(f"{file_path}: {outcome} replacements")
+
+            # Send per-file errors as a single warning
+            if errors:
+                await tool_ctx.warning("\n".join(errors))
 
             # Final progress report
             await tool_ctx.report_progress(total_files, total_files)
@@ -3,8 +3,9 @@
 This module provides the DirectoryTreeTool for viewing file and directory structures.
 """
 
+import os
 from pathlib import Path
-from typing import Annotated, Any, TypedDict, Unpack, final, override
+from typing import Annotated, TypedDict, Unpack, final, override
 
 from fastmcp import Context as MCPContext
 from fastmcp import FastMCP
@@ -142,15 +143,12 @@ requested. Only works within allowed directories."""
                 f"Directory tree filtering: include_filtered={include_filtered}"
             )
 
-            # Check if a directory should be filtered
-            def should_filter(current_path: Path) -> bool:
-                # Don't filter if it's the explicitly requested path
-                if str(current_path.absolute()) == str(dir_path.absolute()):
-                    # Don't filter explicitly requested paths
-                    return False
-
+            # Check if a directory should be filtered. Only entries below the
+            # requested path are checked, so the requested path itself is never
+            # filtered.
+            def should_filter(entry: os.DirEntry[str]) -> bool:
                 # Filter based on directory name if filtering is enabled
-                return current_path.name in filtered_patterns and not include_filtered
+                return entry.name in filtered_patterns and not include_filtered
 
             # Track stats for summary
             stats = {
@@ -160,130 +158,89 @@ requested. Only works within allowed directories."""
                 "skipped_filtered": 0,
             }
 
-            # Build the tree recursively
-            async def build_tree(
-                current_path: Path, current_depth: int = 0
-            ) -> list[dict[str, Any]]:
-                result: list[dict[str, Any]] = []
+            # Allowed roots, read once for the whole walk
+            allowed_roots = tuple(self.permission_manager.allowed_paths)
+
+            # Check if a path may be listed. When including filtered directories,
+            # pattern-based exclusions are ignored and only the basic allowed paths
+            # are checked.
+            def is_allowed(path_str: str) -> bool:
+                if not include_filtered:
+                    return self.is_path_allowed(path_str)
+                resolved_path = Path(path_str).resolve()
+                return any(resolved_path.is_relative_to(root) for root in allowed_roots)
+
+            # Output lines, written directly while walking the tree
+            lines: list[str] = []
 
+            # Build the tree recursively as a simple indented structure
+            async def build_tree(current_path: Path, current_depth: int = 0) -> None:
                 # Skip processing if path isn't allowed, unless we're including filtered dirs
                 # and this path is only excluded due to filtering patterns
-                if not include_filtered and not self.is_path_allowed(str(current_path)):
-                    return result
-                elif include_filtered:
-                    # When including filtered directories, we need to check if the path
-                    # would be allowed if we ignore pattern-based exclusions
-                    # For now, we'll be more permissive and only check the basic allowed paths
-                    path_in_allowed = False
-                    resolved_path = Path(str(current_path)).resolve()
-                    for allowed_path in self.permission_manager.allowed_paths:
-                        try:
-                            resolved_path.relative_to(allowed_path)
-                            path_in_allowed = True
-                            break
-                        except ValueError:
-                            continue
-                    if not path_in_allowed:
-                        return result
+                if not is_allowed(str(current_path)):
+                    return
+
+                # Indentation based on depth
+                indent = "  " * current_depth
 
                 try:
-                    # Sort entries: directories first, then files alphabetically
-                    entries = sorted(
-                        current_path.iterdir(), key=lambda x: (not x.is_dir(), x.name)
-                    )
-
-                    for entry in entries:
-                        if entry.is_dir():
-                            stats["directories"] += 1
-                            entry_data: dict[str, Any] = {
-                                "name": entry.name,
-                                "type": "directory",
-                            }
-
-                            # Check if we should filter this directory
-                            if should_filter(entry):
-                                entry_data["skipped"] = "filtered-directory"
-                                stats["skipped_filtered"] += 1
-                                result.append(entry_data)
-                                continue
-
-                            # Check depth limit (if enabled)
-                            if depth > 0 and current_depth >= depth:
-                                entry_data["skipped"] = "depth-limit"
-                                stats["skipped_depth"] += 1
-                                result.append(entry_data)
-                                continue
-
-                            # Process children recursively with depth increment
-                            entry_data["children"] = await build_tree(
-                                entry, current_depth + 1
+                    # List directories first, then files, each sorted by name.
+                    # os.scandir caches the entry type, so is_dir() does not need
+                    # an extra stat call for each entry.
+                    dirs: list[os.DirEntry[str]] = []
+                    files: list[os.DirEntry[str]] = []
+                    with os.scandir(current_path) as it:
+                        for entry in it:
+                            (dirs if entry.is_dir() else files).append(entry)
+                    dirs.sort(key=lambda e: e.name)
+                    files.sort(key=lambda e: e.name)
+
+                    for entry in dirs:
+                        stats["directories"] += 1
+
+                        # Check if we should filter this directory
+                        if should_filter(entry):
+                            lines.append(
+                                f"{indent}{entry.name}/ [skipped - filtered-directory]"
                             )
-                            result.append(entry_data)
-                        else:
-                            # Skip files that aren't allowed (with same logic as directories)
-                            if not include_filtered and not self.is_path_allowed(
-                                str(entry)
-                            ):
-                                continue
-                            elif include_filtered:
-                                # When including filtered directories, check basic path allowance
-                                path_in_allowed = False
-                                resolved_path = Path(str(entry)).resolve()
-                                for (
-                                    allowed_path
-                                ) in self.permission_manager.allowed_paths:
-                                    try:
-                                        resolved_path.relative_to(allowed_path)
-                                        path_in_allowed = True
-                                        break
-                                    except ValueError:
-                                        continue
-                                if not path_in_allowed:
-                                    continue
-
-                            # Files should be at the same level check as directories
-                            if depth <= 0 or current_depth < depth:
-                                stats["files"] += 1
-                                # Add file entry
-                                result.append({"name": entry.name, "type": "file"})
+                            stats["skipped_filtered"] += 1
+                            continue
 
-                except Exception as e:
-                    await tool_ctx.warning(f"Error processing {current_path}: {str(e)}")
+                        # Check depth limit (if enabled)
+                        if depth > 0 and current_depth >= depth:
+                            lines.append(
+                                f"{indent}{entry.name}/ [skipped - depth-limit]"
+                            )
+                            stats["skipped_depth"] += 1
+                            continue
 
-                return result
+                        # Process children recursively with depth increment
+                        lines.append(f"{indent}{entry.name}/")
+                        await build_tree(Path(entry.path), current_depth + 1)
 
-            # Format the tree as a simple indented structure
-            def format_tree(
-                tree_data: list[dict[str, Any]], level: int = 0
-            ) -> list[str]:
-                lines = []
+                    # Files should be at the same level check as directories.
+                    # Check this once, before the per-file permission check,
+                    # which resolves the path.
+                    if depth > 0 and current_depth >= depth:
+                        return
 
-                for item in tree_data:
-                    # Indentation based on level
-                    indent = "  " * level
+                    for entry in files:
+                        # Skip files that aren't allowed (with same logic as directories)
+                        if not is_allowed(entry.path):
+                            continue
 
-                    # Format based on type
-                    if item["type"] == "directory":
-                        if "skipped" in item:
-                            lines.append(
-                                f"{indent}{item['name']}/ [skipped - {item['skipped']}]"
-                            )
-                        else:
-                            lines.append(f"{indent}{item['name']}/")
-                            # Add children with increased indentation if present
-                            if "children" in item:
-                                lines.extend(format_tree(item["children"], level + 1))
-                    else:
-                        # File
-                        lines.append(f"{indent}{item['name']}")
+                        stats["files"] += 1
+                        # Add file entry
+                        lines.append(f"{indent}{entry.name}")
 
-                return lines
+                except Exception as e:
+                    await tool_ctx.warning(f"Error processing {current_path}: {str(e)}")
 
             # Build tree starting from the requested directory
-            tree_data = await build_tree(dir_path)
+            await build_tree(dir_path)
 
             # Format as simple text
-            formatted_output = "\n".join(format_tree(tree_data))
+            formatted_output = "\n".join(lines)
 
             # Add stats summary
             summary = (
@@ -3,7 +3,6 @@
 This module provides the Edit tool for making precise text replacements in files.
 """
 
-from difflib import unified_diff
 from pathlib import Path
 from typing import Annotated, TypedDict, Unpack, final, override
 
@@ -12,7 +11,7 @@ from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_context
 from pydantic import Field
 
-from mcp_claude_code.tools.filesystem.base import FilesystemBaseTool
+from mcp_claude_code.tools.filesystem.base import FilesystemBaseTool, windowed_diff
 
 FilePath = Annotated[
     str,
@@ -161,8 +160,7 @@ Usage:
                 file_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
                 # Create the new file with the new_string content
-                with open(file_path_obj, "w", encoding="utf-8") as f:
-                    f.write(new_string)
+                self.write_text_file(file_path_obj, new_string)
 
                 await tool_ctx.info(f"Successfully created file: {file_path}")
                 return (
@@ -184,42 +182,38 @@ Usage:
                 with open(file_path_obj, "r", encoding="utf-8") as f:
                     original_content = f.read()
 
-                # Apply edit
-                if old_string in original_content:
-                    # Count occurrences of the old_string in the content
-                    occurrences = original_content.count(old_string)
-
-                    # Check if the number of occurrences matches expected_replacements
-                    if occurrences != expected_replacements:
-                        await tool_ctx.error(
-                            f"Found {occurrences} occurrences of the specified old_string, but expected {expected_replacements}"
-                        )
-                        return f"Error: Found {occurrences} occurrences of the specified old_string, but expected {expected_replacements}. Change your old_string to uniquely identify the target text, or set expected_replacements={occurrences} to replace all occurrences."
-
-                    # Replace all occurrences since the count matches expectations
-                    modified_content = original_content.replace(old_string, new_string)
-                else:
+                # Apply edit, counting occurrences in a single scan
+                occurrences = original_content.count(old_string)
+                if occurrences == 0:
                     # If we can't find the exact string, report an error
                     await tool_ctx.error(
                         "The specified old_string was not found in the file content"
                     )
                     return "Error: The specified old_string was not found in the file content. Please check that it matches exactly, including all whitespace and indentation."
 
-                # Generate diff
-                original_lines = original_content.splitlines(keepends=True)
-                modified_lines = modified_content.splitlines(keepends=True)
-
-                diff_lines = list(
-                    unified_diff(
-                        original_lines,
-                        modified_lines,
-                        fromfile=f"{file_path} (original)",
-                        tofile=f"{file_path} (modified)",
-                        n=3,
+                # Check if the number of occurrences matches expected_replacements
+                if occurrences != expected_replacements:
+                    await tool_ctx.error(
+                        f"Found {occurrences} occurrences of the specified old_string, but expected {expected_replacements}"
                     )
-                )
+                    return f"Error: Found {occurrences} occurrences of the specified old_string, but expected {expected_replacements}. Change your old_string to uniquely identify the target text, or set expected_replacements={occurrences} to replace all occurrences."
 
-                diff_text = "".join(diff_lines)
+                # old_string occurs in the file, so the content only stays the
+                # same when it is replaced by itself; skip the diff in that case
+                if old_string == new_string:
+                    return f"No changes made to file: {file_path}"
+
+                # Replace all occurrences since the count matches expectations
+                modified_content = original_content.replace(old_string, new_string)
+
+                # Generate diff around the replaced region
+                diff_text = windowed_diff(
+                    original_content,
+                    modified_content,
+                    original_content.find(old_string),
+                    original_content.rfind(old_string) + len(old_string),
+                    file_path,
+                )
 
                 # Determine the number of backticks needed
                 num_backticks = 3
@@ -231,17 +225,13 @@ Usage:
                     f"```{num_backticks}diff\n{diff_text}```{num_backticks}\n"
                 )
 
-                # Write the file if there are changes
-                if diff_text:
-                    with open(file_path_obj, "w", encoding="utf-8") as f:
-                        f.write(modified_content)
+                # Write the changed file
+                self.write_text_file(file_path_obj, modified_content)
 
-                    await tool_ctx.info(
-                        f"Successfully edited file: {file_path} ({expected_replacements} replacements applied)"
-                    )
-                    return f"Successfully edited file: {file_path} ({expected_replacements} replacements applied)\n\n{formatted_diff}"
-                else:
-                    return f"No changes made to file: {file_path}"
+                await tool_ctx.info(
+                    f"Successfully edited file: {file_path} ({expected_replacements} replacements applied)"
+                )
+                return f"Successfully edited file: {file_path} ({expected_replacements} replacements applied)\n\n{formatted_diff}"
             except UnicodeDecodeError:
                 await tool_ctx.error(f"Cannot edit binary file: {file_path}")
                 return f"Error: Cannot edit binary file: {file_path}"
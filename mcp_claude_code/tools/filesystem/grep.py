@@ -4,20 +4,36 @@ This module provides the Grep tool for finding text patterns in files using ripg
 """
 
 import asyncio
-import fnmatch
-import json
+import functools
+import io
+import os
 import re
 import shlex
 import shutil
+from collections.abc import Callable
 from pathlib import Path
 from typing import Annotated, TypedDict, Unpack, final, override
 
+import anyio
+from anyio import CapacityLimiter, to_thread
 from fastmcp import Context as MCPContext
 from fastmcp import FastMCP
 from pydantic import Field
 
 from mcp_claude_code.tools.common.context import ToolContext
-from mcp_claude_code.tools.filesystem.base import FilesystemBaseTool
+from mcp_claude_code.tools.filesystem.base import (
+    FilesystemBaseTool,
+    name_matcher,
+    scandir_recursive,
+)
+
+try:
+    # orjson parses ripgrep's NDJSON records from bytes several times faster
+    from orjson import JSONDecodeError
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import JSONDecodeError
+    from json import loads as _json_loads
 
 Pattern = Annotated[
     str,
@@ -35,6 +51,18 @@ SearchPath = Annotated[
     ),
 ]
 
+# Size of each read from ripgrep's stdout
+_RIPGREP_READ_SIZE = 1024 * 1024
+
+# ripgrep serializes the record type first, so begin/end/summary records can be
+# skipped without decoding them
+_MATCH_RECORD_PREFIX = '{"type":"match"'
+_MATCH_RECORD_PREFIX_BYTES = _MATCH_RECORD_PREFIX.encode()
+
+# Matched lines longer than this are truncated the way `rg --max-columns-preview`
+# does; ripgrep ignores --max-columns in --json mode, so it is applied here
+_MAX_COLUMNS = 500
+
 Include = Annotated[
     str,
     Field(
@@ -58,6 +86,119 @@ class GrepToolParams(TypedDict):
     include: Include
 
 
+@functools.cache
+def _ripgrep_path() -> str | None:
+    """Locate the rg executable once per process instead of on every search.
+
+    Returns:
+        Absolute path of rg, or None if it is not installed
+    """
+    return shutil.which("rg")
+
+
+# Number of leading bytes checked for binary content before searching a file
+_SNIFF_SIZE = 8192
+
+# Files larger than this are streamed line by line instead of being decoded
+# whole, so concurrent searches do not hold many large files in memory
+_WHOLE_FILE_SEARCH_LIMIT = 4 * 1024 * 1024
+
+# Scanning files is I/O bound, so use more threads than cores
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _compile_line_search(
+    pattern: str,
+) -> tuple[Callable[[str, int], int] | None, Callable[[str], object]]:
+    """Build the match functions _search_file uses for a pattern.
+
+    Args:
+        pattern: The regular expression pattern to search for
+
+    Returns:
+        Tuple of (find, line_matches) for _search_file; find is None when the
+        pattern must be searched line by line
+    """
+    if re.escape(pattern) == pattern:
+        # Plain text needs no regex engine; substring search is faster. It
+        # cannot contain a newline, so a hit in the whole text is always a hit
+        # in a single line.
+        return (
+            lambda text, pos: text.find(pattern, pos),
+            lambda line: pattern in line,
+        )
+
+    # A regex sees each line with its trailing newline and nothing around it
+    # ($, \s, lookbehinds, \A, \Z), which a whole-text search cannot reproduce
+    return None, re.compile(pattern).search
+
+
+def _search_file(
+    file_path: str,
+    find: Callable[[str, int], int] | None,
+    line_matches: Callable[[str], object],
+) -> list[str]:
+    """Search one file for lines matching a pattern.
+
+    For plain text patterns in files up to _WHOLE_FILE_SEARCH_LIMIT the pattern
+    is searched for across the whole text, and only the lines holding a hit are
+    sliced out, so lines without a match are never visited. Regex patterns and
+    larger files are read and checked one line at a time.
+
+    Args:
+        file_path: Path of the file to search
+        find: Returns the offset of the next possible match at or after a
+            position, or -1 if there is none; None to search line by line
+        line_matches: Returns a truthy value if a single line matches
+
+    Returns:
+        Formatted "path:line: text" results, empty for binary files and files
+        that are not UTF-8
+    """
+    try:
+        with open(file_path, "rb") as f:
+            # Like ripgrep, treat a NUL byte near the start as a binary file so
+            # it is skipped without being read and decoded whole
+            if b"\0" in f.read(_SNIFF_SIZE):
+                return []
+            f.seek(0)
+            text_file = io.TextIOWrapper(f, encoding="utf-8")
+
+            if find is None or os.fstat(f.fileno()).st_size > _WHOLE_FILE_SEARCH_LIMIT:
+                return [
+                    f"{file_path}:{line_num}: {line.rstrip()}"
+                    for line_num, line in enumerate(text_file, 1)
+                    if line_matches(line)
+                ]
+
+            text = text_file.read()
+    except UnicodeDecodeError:
+        # Skip other files that are not UTF-8 text
+        return []
+
+    results: list[str] = []
+    line_num = 1
+    counted_to = 0
+    pos = find(text, 0)
+    while pos != -1:
+        line_start = text.rfind("\n", 0, pos) + 1
+        if line_start == len(text):
+            break
+        line_end = text.find("\n", pos)
+        line_end = len(text) if line_end == -1 else line_end + 1
+
+        line_num += text.count("\n", counted_to, line_start)
+        counted_to = line_start
+
+        line = text[line_start:line_end]
+        if line_matches(line):
+            results.append(f"{file_path}:{line_num}: {line.rstrip()}")
+
+        pos = find(text, line_end) if line_end < len(text) else -1
+
+    return results
+
+
 @final
 class Grep(FilesystemBaseTool):
     """Fast content search tool that works with any codebase size."""
@@ -94,7 +235,7 @@ When you are doing an open ended search that may require multiple rounds of glob
         Returns:
             True if ripgrep is installed, False otherwise
         """
-        return shutil.which("rg") is not None
+        return _ripgrep_path() is not None
 
     async def run_ripgrep(
         self,
@@ -114,15 +255,16 @@ When you are doing an open ended search that may require multiple rounds of glob
         Returns:
             The search results as formatted string
         """
-        # Special case for tests: direct file path with include pattern that doesn't match
-        if Path(path).is_file() and include_pattern and include_pattern != "*":
-            if not fnmatch.fnmatch(Path(path).name, include_pattern):
+        # ripgrep applies -g globs only while walking directories and always
+        # searches explicitly named files, so check a file path here
+        if include_pattern and include_pattern != "*" and Path(path).is_file():
+            if not name_matcher(include_pattern)(Path(path).name):
                 await tool_ctx.info(
                     f"File does not match pattern '{include_pattern}': {path}"
                 )
                 return f"File does not match pattern '{include_pattern}': {path}"
 
-        cmd = ["rg", "--json", pattern]
+        cmd = [_ripgrep_path() or "rg", "--json", pattern]
 
         # Add path
         cmd.append(path)
@@ -136,10 +278,39 @@ When you are doing an open ended search that may require multiple rounds of glob
         try:
             # Execute ripgrep process
             process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
+            assert process.stdout is not None and process.stderr is not None
+
+            # Drain stderr concurrently so a full stderr pipe cannot block ripgrep
+            stderr_task = asyncio.create_task(process.stderr.read())
 
-            stdout, stderr = await process.communicate()
+            # Parse each JSON record as it arrives instead of buffering all output
+            results: list[str] = []
+            files: set[str] = set()
+            errors: list[str] = []
+            try:
+                # Read large chunks and split them into lines here; readline
+                # would await once per record and cap the length of a record
+                buffer = bytearray()
+                while chunk := await process.stdout.read(_RIPGREP_READ_SIZE):
+                    buffer += chunk
+                    end = buffer.rfind(b"\n")
+                    if end == -1:
+                        continue
+                    for line in bytes(buffer[:end]).split(b"\n"):
+                        self.parse_ripgrep_json_line(line, results, files, errors)
+                    del buffer[: end + 1]
+                if buffer:
+                    self.parse_ripgrep_json_line(bytes(buffer), results, files, errors)
+            except BaseException:
+                process.kill()
+                raise
+            finally:
+                stderr = await stderr_task
+                await process.wait()
 
             if process.returncode != 0 and process.returncode != 1:
                 # rg returns 1 when no matches are found, which is not an error
@@ -148,69 +319,105 @@ When you are doing an open ended search that may require multiple rounds of glob
                 )
                 return f"Error executing ripgrep: {stderr.decode()}"
 
-            # Parse the JSON output
-            results = self.parse_ripgrep_json_output(stdout.decode())
-            return results
+            return self.format_ripgrep_results(results, files, errors)
 
         except Exception as e:
             await tool_ctx.error(f"Error running ripgrep: {str(e)}")
             return f"Error running ripgrep: {str(e)}"
 
-    def parse_ripgrep_json_output(self, output: str) -> str:
-        """Parse ripgrep JSON output and format it for human readability.
+    def parse_ripgrep_json_line(
+        self,
+        line: str | bytes,
+        results: list[str],
+        files: set[str],
+        errors: list[str],
+    ) -> None:
+        """Parse one line of ripgrep JSON output and record any match.
 
-        Args:
-            output: The JSON output from ripgrep
+        Records other than matches are skipped before decoding, and matched
+        lines longer than 500 characters end with "[... N more characters]".
 
-        Returns:
-            Formatted string with search results
+        Args:
+            line: A single JSON record from ripgrep
+            results: Formatted "path:line: text" matches found so far
+            files: Paths of the files with matches so far
+            errors: Parse errors found so far
         """
-        if not output.strip():
-            return "No matches found."
-
-        formatted_results = []
-        file_results = {}
-
-        for line in output.splitlines():
-            if not line.strip():
-                continue
+        prefix = (
+            _MATCH_RECORD_PREFIX
+            if isinstance(line, str)
+            else _MATCH_RECORD_PREFIX_BYTES
+        )
+        if not line.startswith(prefix):
+            return
 
-            try:
-                data = json.loads(line)
+        try:
+            data = _json_loads(line)
 
-                if data.get("type") == "match":
-                    path = data.get("data", {}).get("path", {}).get("text", "")
-                    line_number = data.get("data", {}).get("line_number", 0)
+            if data.get("type") == "match":
+                path = data.get("data", {}).get("path", {}).get("text", "")
+                line_number = data.get("data", {}).get("line_number", 0)
+                line_text = (
+                    data.get("data", {}).get("lines", {}).get("text", "").rstrip()
+                )
+                if len(line_text) > _MAX_COLUMNS:
                     line_text = (
-                        data.get("data", {}).get("lines", {}).get("text", "").rstrip()
+                        f"{line_text[:_MAX_COLUMNS]} "
+                        f"[... {len(line_text) - _MAX_COLUMNS} more characters]"
                     )
 
-                    if path not in file_results:
-                        file_results[path] = []
+                # Format each match as soon as it is parsed
+                results.append(f"{path}:{line_number}: {line_text}")
+                files.add(path)
+
+        except JSONDecodeError as e:
+            errors.append(f"Error parsing JSON: {str(e)}")
 
-                    file_results[path].append((line_number, line_text))
+    def format_ripgrep_results(
+        self, results: list[str], files: set[str], errors: list[str]
+    ) -> str:
+        """Format parsed ripgrep matches for human readability.
 
-            except json.JSONDecodeError as e:
-                formatted_results.append(f"Error parsing JSON: {str(e)}")
+        Args:
+            results: Formatted "path:line: text" matches
+            files: Paths of the files with matches
+            errors: Parse errors to report before the matches
 
-        # Count total matches
-        total_matches = sum(len(matches) for matches in file_results.values())
-        total_files = len(file_results)
+        Returns:
+            Formatted string with search results
+        """
+        total_matches = len(results)
+        total_files = len(files)
 
         if total_matches == 0:
             return "No matches found."
 
-        formatted_results.append(
-            f"Found {total_matches} matches in {total_files} file{'s' if total_files > 1 else ''}:"
-        )
-        formatted_results.append("")  # Empty line for readability
+        header = [
+            *errors,
+            f"Found {total_matches} matches in {total_files} file{'s' if total_files > 1 else ''}:",
+            "",  # Empty line for readability
+        ]
+        return "\n".join(header + results)
+
+    def parse_ripgrep_json_output(self, output: str) -> str:
+        """Parse ripgrep JSON output and format it for human readability.
+
+        Args:
+            output: The JSON output from ripgrep
+
+        Returns:
+            Formatted string with search results
+        """
+        if not output.strip():
+            return "No matches found."
 
-        # Format the results by file
-        for file_path, matches in file_results.items():
-            for line_number, line_text in matches:
-                formatted_results.append(f"{file_path}:{line_number}: {line_text}")
+        results: list[str] = []
+        files: set[str] = set()
+        errors: list[str] = []
+        for line in output.splitlines():
+            self.parse_ripgrep_json_line(line, results, files, errors)
 
-        return "\n".join(formatted_results)
+        return self.format_ripgrep_results(results, files, errors)
 
     async def fallback_grep(
         self,
@@ -218,6 +425,7 @@ When you are doing an open ended search that may require multiple rounds of glob
         path: str,
         tool_ctx: ToolContext,
         include_pattern: str | None = None,
+        max_concurrency: int = _MAX_WORKERS,
     ) -> str:
         """Fallback Python implementation when ripgrep is not available.
 
@@ -226,6 +434,7 @@ When you are doing an open ended search that may require multiple rounds of glob
             path: The directory or file to search in
             include_pattern: Optional file pattern to include in the search
             tool_ctx: Tool context for logging
+            max_concurrency: Maximum number of files searched at once
 
         Returns:
             The search results as formatted string
@@ -234,19 +443,23 @@ When you are doing an open ended search that may require multiple rounds of glob
 
         try:
             input_path = Path(path)
+            # Stat the search path once; the result is reused below
+            is_file = input_path.is_file()
+
+            # Compile the search pattern once for every file
+            find, line_matches = _compile_line_search(pattern)
 
             # Find matching files
-            matching_files: list[Path] = []
+            matching_files: list[str] = []
+
+            # Compile the include pattern once rather than per file name
+            name_matches = name_matcher(include_pattern or "*")
 
             # Process based on whether path is a file or directory
-            if input_path.is_file():
+            if is_file:
                 # Single file search - check file pattern match first
-                if (
-                    include_pattern is None
-                    or include_pattern == "*"
-                    or fnmatch.fnmatch(input_path.name, include_pattern)
-                ):
-                    matching_files.append(input_path)
+                if name_matches(input_path.name):
+                    matching_files.append(str(input_path))
                     await tool_ctx.info(f"Searching single file: {path}")
                 else:
                     # File doesn't match the pattern, return immediately
@@ -258,25 +471,18 @@ When you are doing an open ended search that may require multiple rounds of glob
                 # Directory search - find all files
                 await tool_ctx.info(f"Finding files in directory: {path}")
 
-                # Keep track of allowed paths for filtering
-                allowed_paths: set[str] = set()
-
-                # Collect all allowed paths first for faster filtering
-                for entry in input_path.rglob("*"):
-                    entry_path = str(entry)
-                    if self.is_path_allowed(entry_path):
-                        allowed_paths.add(entry_path)
-
-                # Find matching files efficiently
-                for entry in input_path.rglob("*"):
-                    entry_path = str(entry)
-                    if entry_path in allowed_paths and entry.is_file():
-                        if (
-                            include_pattern is None
-                            or include_pattern == "*"
-                            or fnmatch.fnmatch(entry.name, include_pattern)
-                        ):
-                            matching_files.append(entry)
+                # Walk the tree once; scandir entries carry their file type, so
+                # only the cheap checks run before the allowed-path check.
+                # Disallowed directories such as .git are pruned as a whole.
+                for entry in scandir_recursive(
+                    str(input_path), lambda d: self.is_path_allowed(d.path)
+                ):
+                    if (
+                        entry.is_file()
+                        and name_matches(entry.name)
+                        and self.is_path_allowed(entry.path)
+                    ):
+                        matching_files.append(entry.path)
 
                 await tool_ctx.info(f"Found {len(matching_files)} matching files")
             else:
@@ -286,70 +492,57 @@ When you are doing an open ended search that may require multiple rounds of glob
 
             # Report progress
             total_files = len(matching_files)
-            if input_path.is_file():
+            if is_file:
                 await tool_ctx.info(f"Searching file: {path}")
             else:
                 await tool_ctx.info(
                     f"Searching through {total_files} files in directory"
                 )
 
-            # Set up for parallel processing
-            results: list[str] = []
-            files_processed = 0
-            matches_found = 0
-            batch_size = 20  # Process files in batches to avoid overwhelming the system
-
-            # Use a semaphore to limit concurrent file operations
-            semaphore = asyncio.Semaphore(10)
+            # Blocking reads run in worker threads so the event loop stays free;
+            # the limiter alone bounds how many files are open at once
+            limiter = CapacityLimiter(max_concurrency)
 
-            # Create an async function to search a single file
-            async def search_file(file_path: Path) -> list[str]:
-                nonlocal files_processed, matches_found
-                file_results: list[str] = []
+            # Report progress about every 5% of files rather than every batch
+            progress_step = max(10, total_files // 20)
+            file_results: list[list[str] | None] = [None] * total_files
+            completed = 0
 
+            async def search_file(index: int, file_path: str) -> None:
+                nonlocal completed
                 try:
-                    async with semaphore:  # Limit concurrent operations
-                        try:
-                            with open(file_path, "r", encoding="utf-8") as f:
-                                for line_num, line in enumerate(f, 1):
-                                    if re.search(pattern, line):
-                                        file_results.append(
-                                            f"{file_path}:{line_num}: {line.rstrip()}"
-                                        )
-                                        matches_found += 1
-                            files_processed += 1
-                        except UnicodeDecodeError:
-                            # Skip binary files
-                            files_processed += 1
-                        except Exception as e:
-                            await tool_ctx.warning(
-                                f"Error reading {file_path}: {str(e)}"
-                            )
+                    file_results[index] = await to_thread.run_sync(
+                        _search_file,
+                        file_path,
+                        find,
+                        line_matches,
+                        limiter=limiter,
+                    )
                 except Exception as e:
-                    await tool_ctx.warning(f"Error processing {file_path}: {str(e)}")
-
-                return file_results
-
-            # Process files in parallel batches
-            for i in range(0, len(matching_files), batch_size):
-                batch = matching_files[i : i + batch_size]
-                batch_tasks = [search_file(file_path) for file_path in batch]
-
-                # Report progress
-                await tool_ctx.report_progress(i, total_files)
+                    await tool_ctx.warning(f"Error reading {file_path}: {str(e)}")
 
-                # Wait for the batch to complete
-                batch_results = await asyncio.gather(*batch_tasks)
+                completed += 1
+                if completed % progress_step == 0:
+                    await tool_ctx.report_progress(completed, total_files)
 
-                # Flatten and collect results
-                for file_result in batch_results:
-                    results.extend(file_result)
+            async with anyio.create_task_group() as task_group:
+                for index, file_path in enumerate(matching_files):
+                    task_group.start_soon(search_file, index, file_path)
 
             # Final progress report
             await tool_ctx.report_progress(total_files, total_files)
 
+            # Collect results in file order
+            results: list[str] = []
+            files_processed = 0
+            for file_result in file_results:
+                if file_result is not None:
+                    files_processed += 1
+                    results.extend(file_result)
+
+            matches_found = len(results)
             if not results:
-                if input_path.is_file():
+                if is_file:
                     return f"No matches found for pattern '{pattern}' in file: {path}"
                 else:
                     return f"No matches found for pattern '{pattern}' in files matching '{include_pattern or '*'}' in directory: {path}"
@@ -5,9 +5,12 @@ seeing matching lines with useful context showing how they fit into the code str
 """
 
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Annotated, TypedDict, Unpack, final, override
 
+from anyio import to_thread
 from fastmcp import Context as MCPContext
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_context
@@ -65,6 +68,70 @@ class GrepAstToolParams(TypedDict):
     line_number: LineNumber
 
 
+# Parsed files kept between calls, keyed by (path, mtime_ns, size) so an edited
+# file is parsed again
+_TREE_CACHE_SIZE = 128
+_tree_cache: OrderedDict[tuple[str, int, int], TreeContext] = OrderedDict()
+_tree_cache_lock = threading.Lock()
+
+
+def _grep_file(
+    file_path: str, pattern: str, ignore_case: bool, line_number: bool
+) -> str | None:
+    """Find pattern matches in a source file and format them with AST context.
+
+    The parsed TreeContext is cached, so searching an unchanged file again skips
+    reading and parsing it.
+
+    Args:
+        file_path: Path of the source file
+        pattern: The regex pattern to search for
+        ignore_case: Whether to ignore case when matching
+        line_number: Whether to display line numbers
+
+    Returns:
+        The formatted matches, or None if nothing matched
+    """
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+
+    # Take the cached context out while it is in use so concurrent calls on the
+    # same file never share one
+    with _tree_cache_lock:
+        tc = _tree_cache.pop(key, None)
+
+    if tc is None:
+        with open(file_path, "r", encoding="utf-8") as f:
+            code = f.read()
+        tc = TreeContext(
+            file_path,
+            code,
+            color=False,
+            verbose=False,
+            line_number=line_number,
+        )
+    else:
+        # Clear the previous query's state; the parse itself is reusable
+        tc.line_number = line_number
+        tc.lines_of_interest = set()
+        tc.show_lines = set()
+
+    try:
+        # Find matches
+        loi = tc.grep(pattern, ignore_case)
+        if not loi:
+            return None
+
+        tc.add_lines_of_interest(loi)
+        tc.add_context()
+        return tc.format()
+    finally:
+        with _tree_cache_lock:
+            _tree_cache[key] = tc
+            if len(_tree_cache) > _TREE_CACHE_SIZE:
+                _tree_cache.popitem(last=False)
+
+
 @final
 class GrepAstTool(FilesystemBaseTool):
     """Tool for searching through source code files with AST context."""
@@ -174,37 +241,21 @@ grep_ast(pattern="function_name", path="/path/to/file.py", ignore_case=False, li
             await tool_ctx.report_progress(processed_count, len(files_to_process))
 
             try:
-                # Read the file
-                with open(file_path, "r", encoding="utf-8") as f:
-                    code = f.read()
-
-                # Process the file with grep-ast
-                try:
-                    tc = TreeContext(
-                        file_path,
-                        code,
-                        color=False,
-                        verbose=False,
-                        line_number=line_number,
-                    )
-
-                    # Find matches
-                    loi = tc.grep(pattern, ignore_case)
-
-                    if loi:
-                        tc.add_lines_of_interest(loi)
-                        tc.add_context()
-                        output = tc.format()
-
-                        # Add the result to our list
-                        results.append(f"\n{file_path}:\n{output}\n")
-                except Exception as e:
-                    # Skip files that can't be parsed by tree-sitter
-                    await tool_ctx.warning(f"Could not parse {file_path}: {str(e)}")
+                # Parsing is CPU-bound, so run it off the event loop
+                output = await to_thread.run_sync(
+                    _grep_file, file_path, pattern, ignore_case, line_number
+                )
+
+                if output is not None:
+                    # Add the result to our list
+                    results.append(f"\n{file_path}:\n{output}\n")
             except UnicodeDecodeError:
                 await tool_ctx.warning(f"Could not read {file_path} as text")
-            except Exception as e:
+            except OSError as e:
                 await tool_ctx.error(f"Error processing {file_path}: {str(e)}")
+            except Exception as e:
+                # Skip files that can't be parsed by tree-sitter
+                await tool_ctx.warning(f"Could not parse {file_path}: {str(e)}")
 
             processed_count += 1
 
@@ -3,7 +3,8 @@
 This module provides the MultiEdit tool for making multiple precise text replacements in files.
 """
 
-from difflib import unified_diff
+import os
+import stat
 from pathlib import Path
 from typing import Annotated, TypedDict, Unpack, final, override
 
@@ -12,7 +13,7 @@ from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_context
 from pydantic import Field
 
-from mcp_claude_code.tools.filesystem.base import FilesystemBaseTool
+from mcp_claude_code.tools.filesystem.base import FilesystemBaseTool, windowed_diff
 
 FilePath = Annotated[
     str,
@@ -67,6 +68,100 @@ class MultiEditToolParams(TypedDict):
     edits: Edits
 
 
+def _find_occurrences(content: str, old_string: str) -> list[int]:
+    """Find where a string occurs in content.
+
+    Occurrences are found left to right without overlapping, the same ones
+    str.count and str.replace use.
+
+    Args:
+        content: Text to search
+        old_string: Text to find
+
+    Returns:
+        Start offsets of each occurrence
+    """
+    offsets: list[int] = []
+    # An empty string occurs at every position, so always move forward
+    step = len(old_string) or 1
+    pos = content.find(old_string)
+    while pos != -1:
+        offsets.append(pos)
+        pos = content.find(old_string, pos + step)
+    return offsets
+
+
+def _replace_at(content: str, offsets: list[int], old_length: int, new: str) -> str:
+    """Replace the text at known offsets in a single pass.
+
+    Args:
+        content: Text to edit
+        offsets: Start offsets of the text to replace, in ascending order
+        old_length: Length of the text being replaced
+        new: Replacement text
+
+    Returns:
+        The edited content
+    """
+    parts: list[str] = []
+    prev = 0
+    for offset in offsets:
+        parts.append(content[prev:offset])
+        parts.append(new)
+        prev = offset + old_length
+    parts.append(content[prev:])
+    return "".join(parts)
+
+
+# Block size used when comparing the original and edited content
+_COMPARE_BLOCK = 4096
+
+
+def _changed_region(original: str, modified: str) -> tuple[int, int]:
+    """Find the part of original that differs from modified.
+
+    Common leading and trailing text is skipped a block at a time, so the
+    comparison runs in C over the unchanged text.
+
+    Args:
+        original: Original file content
+        modified: Edited file content
+
+    Returns:
+        tuple of (start, end) offsets in original; outside them, original and
+        modified are identical
+    """
+    limit = min(len(original), len(modified))
+
+    # Length of the common prefix
+    start = 0
+    while (
+        start + _COMPARE_BLOCK <= limit
+        and original[start : start + _COMPARE_BLOCK]
+        == modified[start : start + _COMPARE_BLOCK]
+    ):
+        start += _COMPARE_BLOCK
+    while start < limit and original[start] == modified[start]:
+        start += 1
+
+    # Length of the common suffix, not overlapping the prefix
+    limit -= start
+    suffix = 0
+    while (
+        suffix + _COMPARE_BLOCK <= limit
+        and original[len(original) - suffix - _COMPARE_BLOCK : len(original) - suffix]
+        == modified[len(modified) - suffix - _COMPARE_BLOCK : len(modified) - suffix]
+    ):
+        suffix += _COMPARE_BLOCK
+    while (
+        suffix < limit
+        and original[len(original) - suffix - 1] == modified[len(modified) - suffix - 1]
+    ):
+        suffix += 1
+
+    return start, len(original) - suffix
+
+
 @final
 class MultiEdit(FilesystemBaseTool):
     """Tool for making multiple precise text replacements in files."""
@@ -160,7 +255,8 @@ If you want to create a new file, use:
             await tool_ctx.error(path_validation.error_message)
             return f"Error: {path_validation.error_message}"
 
-        # Validate each edit
+        # Validate each edit, keeping its fields for the apply loop below
+        prepared_edits: list[tuple[str, str, int]] = []
         for i, edit in enumerate(edits):
             if not isinstance(edit, dict):
                 await tool_ctx.error(f"Edit at index {i} must be an object")
@@ -200,6 +296,8 @@ If you want to create a new file, use:
                     f"Error: Edit at index {i}: old_string and new_string are identical"
                 )
 
+            prepared_edits.append((old_string, new_string, expected_replacements))
+
         await tool_ctx.info(f"Applying {len(edits)} edits to file: {file_path}")
 
         # Check if file is allowed to be edited
@@ -210,9 +308,15 @@ If you want to create a new file, use:
         try:
             file_path_obj = Path(file_path)
 
+            # Stat the file once; existence and type checks below reuse it
+            try:
+                file_stat: os.stat_result | None = file_path_obj.stat()
+            except OSError:
+                file_stat = None
+
             # Handle file creation case (when first edit has empty old_string)
-            first_edit = edits[0]
-            if not file_path_obj.exists() and first_edit.get("old_string") == "":
+            first_old, first_new, _ = prepared_edits[0]
+            if file_stat is None and first_old == "":
                 # Check if parent directory is allowed
                 parent_dir = str(file_path_obj.parent)
                 if not self.is_path_allowed(parent_dir):
@@ -223,21 +327,23 @@ If you want to create a new file, use:
                 file_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
                 # Start with the content from the first edit
-                current_content = first_edit.get("new_string", "")
+                current_content = first_new
 
                 # Apply remaining edits to this content
-                edits_to_apply = edits[1:]
+                edits_to_apply = prepared_edits[1:]
                 creation_mode = True
             else:
                 # Normal edit mode - file must exist
-                exists, error_msg = await self.check_path_exists(file_path, tool_ctx)
-                if not exists:
-                    return error_msg
+                if file_stat is None:
+                    message = f"Path does not exist: {file_path}"
+                    await tool_ctx.error(message)
+                    return f"Error: {message}"
 
                 # Check is a file
-                is_file, error_msg = await self.check_is_file(file_path, tool_ctx)
-                if not is_file:
-                    return error_msg
+                if not stat.S_ISREG(file_stat.st_mode):
+                    message = f"Path is not a file: {file_path}"
+                    await tool_ctx.error(message)
+                    return f"Error: {message}"
 
                 # Read the file
                 try:
@@ -247,7 +353,7 @@ If you want to create a new file, use:
                     await tool_ctx.error(f"Cannot edit binary file: {file_path}")
                     return f"Error: Cannot edit binary file: {file_path}"
 
-                edits_to_apply = edits
+                edits_to_apply = prepared_edits
                 creation_mode = False
 
             # Store original content for diff generation
@@ -255,13 +361,15 @@ If you want to create a new file, use:
 
             # Apply all edits sequentially
             total_replacements = 0
-            for i, edit in enumerate(edits_to_apply):
-                old_string = edit.get("old_string")
-                new_string = edit.get("new_string")
-                expected_replacements = edit.get("expected_replacements", 1)
+            for i, (old_string, new_string, expected_replacements) in enumerate(
+                edits_to_apply
+            ):
+                # Find every occurrence in one scan; the offsets are reused to
+                # build the replaced content
+                offsets = _find_occurrences(current_content, old_string)
 
                 # Check if old_string exists in current content
-                if old_string not in current_content:
+                if not offsets:
                     edit_index = (
                         i + 1 if not creation_mode else i + 2
                     )  # Adjust for display
@@ -271,7 +379,7 @@ If you want to create a new file, use:
                     return f"Error: Edit {edit_index}: The specified old_string was not found in the file content. Please check that it matches exactly, including all whitespace and indentation."
 
                 # Count occurrences
-                occurrences = current_content.count(old_string)
+                occurrences = len(offsets)
 
                 # Check if the number of occurrences matches expected_replacements
                 if occurrences != expected_replacements:
@@ -284,24 +392,21 @@ If you want to create a new file, use:
                     return f"Error: Edit {edit_index}: Found {occurrences} occurrences of the specified old_string, but expected {expected_replacements}. Change your old_string to uniquely identify the target text, or set expected_replacements={occurrences} to replace all occurrences."
 
                 # Apply the replacement
-                current_content = current_content.replace(old_string, new_string)
+                current_content = _replace_at(
+                    current_content, offsets, len(old_string), new_string
+                )
                 total_replacements += expected_replacements
 
-            # Generate diff
-            original_lines = original_content.splitlines(keepends=True)
-            modified_lines = current_content.splitlines(keepends=True)
-
-            diff_lines = list(
-                unified_diff(
-                    original_lines,
-                    modified_lines,
-                    fromfile=f"{file_path} (original)",
-                    tofile=f"{file_path} (modified)",
-                    n=3,
-                )
-            )
+            # Edits that cancel each other out leave nothing to diff or write
+            if not creation_mode and current_content == original_content:
+                return f"No changes made to file: {file_path}"
 
-            diff_text = "".join(diff_lines)
+            # Generate diff over the region that differs rather than the whole
+            # file
+            start, end = _changed_region(original_content, current_content)
+            diff_text = windowed_diff(
+                original_content, current_content, start, end, file_path
+            )
 
             # Determine the number of backticks needed
             num_backticks = 3
@@ -3,6 +3,7 @@
 This module provides the ReadTool for reading the contents of files.
 """
 
+import itertools
 from pathlib import Path
 from typing import Annotated, TypedDict, Unpack, final, override
 
@@ -13,6 +14,9 @@ from pydantic import Field
 
 from mcp_claude_code.tools.filesystem.base import FilesystemBaseTool
 
+# Number of lines read when no limit is given
+_DEFAULT_LINE_LIMIT = 2000
+
 FilePath = Annotated[
     str,
     Field(
@@ -32,7 +36,7 @@ Limit = Annotated[
     int,
     Field(
         description="The number of lines to read. Only provide if the file is too large to read at once",
-        default=2000,
+        default=_DEFAULT_LINE_LIMIT,
     ),
 ]
 
@@ -51,12 +55,17 @@ class ReadToolParams(TypedDict):
     limit: Limit
 
 
+# Line number prefixes for the lines of a default read, built once so the
+# common case does not format a number for every line
+_LINE_PREFIXES = [f"{i:6d}  " for i in range(1, _DEFAULT_LINE_LIMIT + 1)]
+
+
 @final
 class ReadTool(FilesystemBaseTool):
     """Tool for reading file contents."""
 
     # Default values for truncation
-    DEFAULT_LINE_LIMIT = 2000
+    DEFAULT_LINE_LIMIT = _DEFAULT_LINE_LIMIT
     MAX_LINE_LENGTH = 2000
     LINE_TRUNCATION_INDICATOR = "... [line truncated]"
 
@@ -118,6 +127,13 @@ Usage:
             await tool_ctx.error("Parameter 'file_path' is required but was None")
             return "Error: Parameter 'file_path' is required but was None"
 
+        if limit < 0:
+            await tool_ctx.error("Parameter 'limit' must be a non-negative number")
+            return "Error: Parameter 'limit' must be a non-negative number"
+
+        # A negative offset reads from the start of the file
+        offset = max(0, offset)
+
         await tool_ctx.info(
             f"Reading file: {file_path} (offset: {offset}, limit: {limit})"
         )
@@ -144,65 +160,18 @@ Usage:
 
             # Read the file
             try:
-                # Read and process the file with line numbers and truncation
-                lines = []
-                current_line = 0
-                truncated_lines = 0
-
                 # Try with utf-8 encoding first
                 try:
-                    with open(file_path_obj, "r", encoding="utf-8") as f:
-                        for i, line in enumerate(f):
-                            # Skip lines before offset
-                            if i < offset:
-                                continue
-
-                            # Stop after reading 'limit' lines
-                            if current_line >= limit:
-                                truncated_lines = True
-                                break
-
-                            current_line += 1
-
-                            # Truncate long lines
-                            if len(line) > self.MAX_LINE_LENGTH:
-                                line = (
-                                    line[: self.MAX_LINE_LENGTH]
-                                    + self.LINE_TRUNCATION_INDICATOR
-                                )
-
-                            # Add line with line number (1-based)
-                            lines.append(f"{i + 1:6d}  {line.rstrip()}")
+                    lines, truncated_lines = self._read_numbered_lines(
+                        file_path_obj, "utf-8", offset, limit
+                    )
 
                 except UnicodeDecodeError:
                     # Try with latin-1 encoding
                     try:
-                        lines = []
-                        current_line = 0
-                        truncated_lines = 0
-
-                        with open(file_path_obj, "r", encoding="latin-1") as f:
-                            for i, line in enumerate(f):
-                                # Skip lines before offset
-                                if i < offset:
-                                    continue
-
-                                # Stop after reading 'limit' lines
-                                if current_line >= limit:
-                                    truncated_lines = True
-                                    break
-
-                                current_line += 1
-
-                                # Truncate long lines
-                                if len(line) > self.MAX_LINE_LENGTH:
-                                    line = (
-                                        line[: self.MAX_LINE_LENGTH]
-                                        + self.LINE_TRUNCATION_INDICATOR
-                                    )
-
-                                # Add line with line number (1-based)
-                                lines.append(f"{i + 1:6d}  {line.rstrip()}")
+                        lines, truncated_lines = self._read_numbered_lines(
+                            file_path_obj, "latin-1", offset, limit
+                        )
 
                         await tool_ctx.warning(
                             f"File read with latin-1 encoding: {file_path}"
@@ -230,6 +199,54 @@ Usage:
             await tool_ctx.error(f"Error reading file: {str(e)}")
             return f"Error: {str(e)}"
 
+    def _read_numbered_lines(
+        self, file_path: Path, encoding: str, offset: int, limit: int
+    ) -> tuple[list[str], bool]:
+        """Read a window of lines from a file, numbered and length-limited.
+
+        Args:
+            file_path: File to read
+            encoding: Text encoding of the file
+            offset: Number of lines to skip
+            limit: Maximum number of lines to return
+
+        Returns:
+            tuple of (formatted lines, whether the file has more lines)
+        """
+        max_length = self.MAX_LINE_LENGTH
+        indicator = self.LINE_TRUNCATION_INDICATOR
+
+        prefixes = _LINE_PREFIXES
+        num_prefixes = len(prefixes)
+
+        lines: list[str] = []
+        # Read raw lines so the lines before offset are split but never
+        # decoded; only the lines returned are decoded
+        with open(file_path, "rb") as f:
+            # Split each LF-terminated chunk again so CR and CRLF also end a
+            # line, as in text mode, with the line endings removed
+            all_lines = itertools.chain.from_iterable(map(bytes.splitlines, f))
+
+            # islice skips the lines before offset and stops at the limit in C
+            # rather than checking both bounds for every line
+            window = itertools.islice(all_lines, offset, offset + limit)
+            for i, raw_line in enumerate(window, offset + 1):
+                line = raw_line.decode(encoding)
+
+                # Truncate long lines
+                if len(line) > max_length:
+                    line = line[:max_length] + indicator
+
+                # Add line with line number (1-based)
+                if i <= num_prefixes:
+                    lines.append(prefixes[i - 1] + line.rstrip())
+                else:
+                    lines.append(f"{i:6d}  {line.rstrip()}")
+
+            has_more = len(lines) == limit and next(all_lines, None) is not None
+
+        return lines, has_more
+
     @override
     def register(self, mcp_server: FastMCP) -> None:
         """Register this tool with the MCP server.
@@ -1,5 +1,6 @@
 """Tests for the CLI module."""
 
+import json
 import os
 import sys
 from pathlib import Path
@@ -8,7 +9,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from mcp_claude_code.cli import install_claude_desktop_config, main
+from mcp_claude_code.cli import _build_parser, install_claude_desktop_config, main
 
 
 class TestCLI:
@@ -18,7 +19,7 @@ class TestCLI:
         """Test the main function running the server."""
         with (
             patch("argparse.ArgumentParser.parse_args") as mock_parse_args,
-            patch("mcp_claude_code.cli.ClaudeCodeServer") as mock_server_class,
+            patch("mcp_claude_code.server.ClaudeCodeServer") as mock_server_class,
         ):
             # Mock parsed arguments
             mock_args = MagicMock()
@@ -65,6 +66,36 @@ class TestCLI:
             )
             mock_server.run.assert_called_once_with(transport="stdio")
 
+    def test_main_deduplicates_allowed_paths(self) -> None:
+        """Test that equivalent allowed paths are only passed once."""
+        with (
+            patch("argparse.ArgumentParser.parse_args") as mock_parse_args,
+            patch("mcp_claude_code.server.ClaudeCodeServer") as mock_server_class,
+        ):
+            # Mock parsed arguments
+            mock_args = MagicMock()
+            mock_args.name = "test-server"
+            mock_args.transport = "stdio"
+            mock_args.allowed_paths = ["/test/path", "/test/path/", "/other/path"]
+            mock_args.project_paths = None
+            mock_args.install = False
+            mock_args.allowed_patterns = None
+            mock_parse_args.return_value = mock_args
+
+            # Call main
+            main()
+
+            # Verify duplicates were dropped while keeping the original order
+            _, kwargs = mock_server_class.call_args
+            assert kwargs["allowed_paths"] == ["/test/path", "/other/path"]
+
+    def test_parser_accepts_abbreviated_options(self) -> None:
+        """Test that unambiguous option prefixes are still accepted."""
+        args = _build_parser().parse_args(["--proj", "/test/project", "--comm", "5"])
+
+        assert args.project_paths == ["/test/project"]
+        assert args.command_timeout == 5.0
+
     def test_main_with_install(self) -> None:
         """Test the main function with install option."""
         with (
@@ -91,7 +122,7 @@ class TestCLI:
         """Test the main function without specified allowed paths."""
         with (
             patch("argparse.ArgumentParser.parse_args") as mock_parse_args,
-            patch("mcp_claude_code.cli.ClaudeCodeServer") as mock_server_class,
+            patch("mcp_claude_code.server.ClaudeCodeServer") as mock_server_class,
             patch("os.getcwd", return_value="/current/dir"),
         ):
             # Mock parsed arguments
@@ -161,50 +192,31 @@ class TestInstallClaudeDesktopConfig:
         # Set platform to macOS
         mock_platform("darwin")
 
-        # Mock home directory and config path
+        # Mock home directory and interpreter path
         with (
             patch("pathlib.Path.home", return_value=Path(tmp_path)),
             patch("sys.executable", "/usr/bin/python3"),
-            patch("json.dump") as mock_json_dump,
-            patch("builtins.open", create=True) as mock_open,
-            patch("pathlib.Path.exists", return_value=False),
-            patch("pathlib.Path.mkdir") as mock_mkdir,
         ):
-            # Construct expected config path
-            config_dir = tmp_path / "Library" / "Application Support" / "Claude"
-            config_file = config_dir / "claude_desktop_config.json"
-
-            # Mock file opening
-            mock_file = MagicMock()
-            mock_open.return_value.__enter__.return_value = mock_file
-
             # Call the install function
             install_claude_desktop_config("test-server", allowed_paths=["/test/path"])
 
-            # Verify config directory was created
-            mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
-
-            # Verify file was opened correctly
-            mock_open.assert_called_once()
-            args, kwargs = mock_open.call_args
-            assert str(config_file) in str(args[0])
-            assert kwargs.get("mode") == "w"
-            # Note: The mode parameter is set via a positional argument, not a keyword
-            # so we're not checking it here
-
-            # Verify correct config was written
-            mock_json_dump.assert_called_once()
-            config_data = mock_json_dump.call_args[0][0]
-            assert "mcpServers" in config_data
-            assert "test-server" in config_data["mcpServers"]
-            assert (
-                "/usr/bin/python3"
-                in config_data["mcpServers"]["test-server"]["command"]
-            )
-            assert "--allow-path" in str(
-                config_data["mcpServers"]["test-server"]["args"]
-            )
-            assert "/test/path" in str(config_data["mcpServers"]["test-server"]["args"])
+        # Verify the config was written to the macOS location
+        config_file = (
+            tmp_path
+            / "Library"
+            / "Application Support"
+            / "Claude"
+            / "claude_desktop_config.json"
+        )
+        assert config_file.is_file()
+
+        # Verify correct config was written
+        config_data = json.loads(config_file.read_text(encoding="utf-8"))
+        assert "mcpServers" in config_data
+        assert "test-server" in config_data["mcpServers"]
+        assert "/usr/bin/python3" in config_data["mcpServers"]["test-server"]["command"]
+        assert "--allow-path" in config_data["mcpServers"]["test-server"]["args"]
+        assert "/test/path" in config_data["mcpServers"]["test-server"]["args"]
 
     def test_install_config_windows(
         self, mock_platform: Callable[[str], str], tmp_path: Path
@@ -217,35 +229,18 @@ class TestInstallClaudeDesktopConfig:
         with (
             patch.dict(os.environ, {"APPDATA": str(tmp_path)}),
             patch("sys.executable", "C:\\Python\\python.exe"),
-            patch("json.dump") as mock_json_dump,
-            patch("builtins.open", create=True) as mock_open,
-            patch("pathlib.Path.exists", return_value=False),
-            patch("pathlib.Path.mkdir") as mock_mkdir,
         ):
-            # Construct expected config path
-            config_dir = Path(tmp_path) / "Claude"
-            config_file = config_dir / "claude_desktop_config.json"
-
-            # Mock file opening
-            mock_file = MagicMock()
-            mock_open.return_value.__enter__.return_value = mock_file
-
             # Call the install function
             install_claude_desktop_config("test-server")
 
-            # Verify config directory was created
-            mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
-
-            # Verify file was opened correctly
-            mock_open.assert_called_once()
-            args, kwargs = mock_open.call_args
-            assert str(config_file) in str(args[0])
+        # Verify the config was written under APPDATA
+        config_file = tmp_path / "Claude" / "claude_desktop_config.json"
+        assert config_file.is_file()
 
-            # Verify correct config was written
-            mock_json_dump.assert_called_once()
-            config_data = mock_json_dump.call_args[0][0]
-            assert "mcpServers" in config_data
-            assert "test-server" in config_data["mcpServers"]
+        # Verify correct config was written
+        config_data = json.loads(config_file.read_text(encoding="utf-8"))
+        assert "mcpServers" in config_data
+        assert "test-server" in config_data["mcpServers"]
 
     def test_install_config_merge_existing(
         self, mock_platform: Callable[[str], str], tmp_path: Path
@@ -254,7 +249,7 @@ class TestInstallClaudeDesktopConfig:
         # Set platform to Linux
         mock_platform("linux")
 
-        # Create a mock existing config
+        # Create an existing config
         existing_config = {
             "mcpServers": {
                 "existing-server": {
@@ -264,41 +259,25 @@ class TestInstallClaudeDesktopConfig:
             },
             "otherSetting": "value",
         }
+        config_dir = tmp_path / ".config" / "claude"
+        config_dir.mkdir(parents=True)
+        config_file = config_dir / "claude_desktop_config.json"
+        config_file.write_text(json.dumps(existing_config), encoding="utf-8")
 
-        # Mock home directory and config path
+        # Mock home directory and interpreter path
         with (
             patch("pathlib.Path.home", return_value=Path(tmp_path)),
             patch("sys.executable", "/usr/bin/python3"),
-            patch("json.dump") as mock_json_dump,
-            patch("json.load", return_value=existing_config),
-            patch("builtins.open", create=True) as mock_open,
-            patch("pathlib.Path.exists", return_value=True),
-            patch("pathlib.Path.mkdir") as mock_mkdir,
         ):
-            # Construct expected config path
-            config_dir = tmp_path / ".config" / "claude"
-            config_dir / "claude_desktop_config.json"
-
-            # Mock file opening
-            mock_file = MagicMock()
-            mock_open.return_value.__enter__.return_value = mock_file
-
             # Call the install function
             install_claude_desktop_config("test-server")
 
-            # Verify config directory was created
-            mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
-
-            # Verify file was opened correctly for reading and writing
-            assert mock_open.call_count == 2
-
-            # Verify correct config was written
-            mock_json_dump.assert_called_once()
-            config_data = mock_json_dump.call_args[0][0]
-            assert "mcpServers" in config_data
-            assert "existing-server" in config_data["mcpServers"]
-            assert "test-server" in config_data["mcpServers"]
-            assert "otherSetting" in config_data
+        # Verify the existing config was merged with the new server
+        config_data = json.loads(config_file.read_text(encoding="utf-8"))
+        assert "mcpServers" in config_data
+        assert "existing-server" in config_data["mcpServers"]
+        assert "test-server" in config_data["mcpServers"]
+        assert config_data["otherSetting"] == "value"
 
     def test_install_config_default_paths(
         self, mock_platform: Callable[[str], str], tmp_path: Path
@@ -307,28 +286,50 @@ class TestInstallClaudeDesktopConfig:
         # Set platform to macOS
         mock_platform("darwin")
 
-        # Mock home directory and config path
+        # Mock home directory and interpreter path
         with (
             patch("pathlib.Path.home", return_value=Path(tmp_path)),
             patch("sys.executable", "/usr/bin/python3"),
-            patch("json.dump") as mock_json_dump,
-            patch("builtins.open", create=True) as mock_open,
-            patch("pathlib.Path.exists", return_value=False),
-            patch("pathlib.Path.mkdir"),
         ):
-            # Mock file opening
-            mock_file = MagicMock()
-            mock_open.return_value.__enter__.return_value = mock_file
-
             # Call the install function without specifying allowed_paths
             install_claude_desktop_config("test-server")
 
-            # Verify correct config was written with home directory as allowed path
-            mock_json_dump.assert_called_once()
-            config_data = mock_json_dump.call_args[0][0]
-            server_args = config_data["mcpServers"]["test-server"]["args"]
+        # Verify correct config was written with home directory as allowed path
+        config_file = (
+            tmp_path
+            / "Library"
+            / "Application Support"
+            / "Claude"
+            / "claude_desktop_config.json"
+        )
+        config_data = json.loads(config_file.read_text(encoding="utf-8"))
+        server_args = config_data["mcpServers"]["test-server"]["args"]
+
+        # Verify home directory was added as an allowed path
+        assert "--allow-path" in server_args
+        home_path_index = server_args.index("--allow-path") + 1
+        assert str(tmp_path) in server_args[home_path_index]
+
+    def test_install_config_unchanged_skips_write(
+        self,
+        mock_platform: Callable[[str], str],
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that reinstalling an identical config does not rewrite the file."""
+        # Set platform to Linux
+        mock_platform("linux")
+
+        with (
+            patch("pathlib.Path.home", return_value=Path(tmp_path)),
+            patch("sys.executable", "/usr/bin/python3"),
+        ):
+            install_claude_desktop_config("test-server")
+            capsys.readouterr()
+
+            with patch("pathlib.Path.write_bytes") as mock_write_bytes:
+                install_claude_desktop_config("test-server")
 
-            # Verify home directory was added as an allowed path
-            assert "--allow-path" in server_args
-            home_path_index = server_args.index("--allow-path") + 1
-            assert str(tmp_path) in server_args[home_path_index]
+        # Verify the identical config was not written again
+        mock_write_bytes.assert_not_called()
+        assert "already up to date" in capsys.readouterr().out
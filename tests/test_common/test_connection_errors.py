@@ -0,0 +1,62 @@
+"""Tests for the handle_connection_errors decorator."""
+
+import pytest
+from anyio import ClosedResourceError
+
+from mcp_claude_code.tools.common.base import handle_connection_errors
+
+
+class TestHandleConnectionErrors:
+    """Test cases for handle_connection_errors."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error", [ClosedResourceError(), ConnectionError(), BrokenPipeError()]
+    )
+    async def test_connection_errors_are_reported(self, error):
+        """Test that disconnect errors are turned into a message."""
+
+        @handle_connection_errors
+        async def tool_func() -> str:
+            raise error
+
+        result = await tool_func()
+        assert result == (
+            f"Client disconnected during operation: {type(error).__name__}"
+        )
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_reraised(self):
+        """Test that unrelated errors propagate unchanged."""
+
+        @handle_connection_errors
+        async def tool_func() -> str:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await tool_func()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error_type", [ConnectionRefusedError, ConnectionResetError]
+    )
+    async def test_connection_error_subclasses_are_reraised(self, error_type):
+        """Test that a tool's own network failures are not reported as disconnects."""
+
+        @handle_connection_errors
+        async def tool_func() -> str:
+            raise error_type("refused")
+
+        with pytest.raises(error_type, match="refused"):
+            await tool_func()
+
+    @pytest.mark.asyncio
+    async def test_wrapper_preserves_metadata_and_result(self):
+        """Test that the wrapper keeps the function name and return value."""
+
+        @handle_connection_errors
+        async def tool_func() -> str:
+            return "ok"
+
+        assert tool_func.__name__ == "tool_func"
+        assert await tool_func() == "ok"
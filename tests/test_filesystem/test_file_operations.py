@@ -16,6 +16,7 @@ from mcp_claude_code.tools.filesystem.content_replace import ContentReplaceTool
 from mcp_claude_code.tools.filesystem.directory_tree import DirectoryTreeTool
 from mcp_claude_code.tools.filesystem.edit import Edit
 from mcp_claude_code.tools.filesystem.grep import Grep
+from mcp_claude_code.tools.filesystem.multi_edit import MultiEdit
 from mcp_claude_code.tools.filesystem.read import ReadTool
 from mcp_claude_code.tools.filesystem.write import Write
 
@@ -120,6 +121,103 @@ class TestReadTool:
         assert "This is line 1" not in result  # Before offset
         assert "This is line 6" not in result  # After limit
 
+    @pytest.mark.asyncio
+    async def test_read_file_with_negative_offset_and_limit(
+        self,
+        read_files_tool: ReadTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test reading with a negative offset or limit."""
+        test_file = os.path.join(setup_allowed_path, "negative_test.txt")
+        with open(test_file, "w") as f:
+            f.write("first line\nsecond line\n")
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+            with patch.object(
+                FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+            ):
+                offset_result = await read_files_tool.call(
+                    mcp_context, file_path=test_file, offset=-5
+                )
+                limit_result = await read_files_tool.call(
+                    mcp_context, file_path=test_file, limit=-1
+                )
+
+        # A negative offset reads from the start of the file
+        assert offset_result == "     1  first line\n     2  second line"
+        assert limit_result == "Error: Parameter 'limit' must be a non-negative number"
+
+    @pytest.mark.asyncio
+    async def test_read_file_offset_skips_undecodable_lines(
+        self,
+        read_files_tool: ReadTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that lines before the offset are not decoded."""
+        test_file = os.path.join(setup_allowed_path, "mixed_encoding.txt")
+        with open(test_file, "wb") as f:
+            f.write(b"caf\xe9\r\n")  # Not valid utf-8
+            f.write("naïve\r\n".encode("utf-8"))
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+            with patch.object(
+                FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+            ):
+                result = await read_files_tool.call(
+                    mcp_context, file_path=test_file, offset=1, limit=1
+                )
+
+        # The kept line is read as utf-8 without falling back to latin-1
+        assert result == "     2  naïve"
+        tool_ctx.warning.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            (
+                b"x" * 1999 + b"\r\nend\r\n",
+                f"     1  {'x' * 1999}\n     2  end",
+            ),
+            (b"a\rb\rc", "     1  a\n     2  b\n     3  c"),
+            (b"a\r\n\rb\n", "     1  a\n     2  \n     3  b"),
+        ],
+    )
+    async def test_read_file_line_endings(
+        self,
+        read_files_tool: ReadTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+        content: bytes,
+        expected: str,
+    ):
+        """Test that CRLF and bare CR end lines without counting toward their length."""
+        test_file = os.path.join(setup_allowed_path, "line_endings.txt")
+        with open(test_file, "wb") as f:
+            f.write(content)
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+            with patch.object(
+                FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+            ):
+                result = await read_files_tool.call(mcp_context, file_path=test_file)
+
+        assert result == expected
+
     @pytest.mark.asyncio
     async def test_read_file_missing_path(
         self,
@@ -382,6 +480,52 @@ class TestEdit:
             "Error: Parameter 'old_string' cannot be empty for existing files" in result
         )
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tool_class", [Edit, MultiEdit])
+    async def test_edit_diff_hunk_header_far_from_start(
+        self,
+        permission_manager: "PermissionManager",
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+        tool_class: type[Edit] | type[MultiEdit],
+    ):
+        """Test that diff hunk headers use the file's line numbers."""
+        test_file = os.path.join(setup_allowed_path, "hundred_lines.txt")
+        with open(test_file, "w") as f:
+            f.write("".join(f"line {i}\n" for i in range(1, 101)))
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        tool = tool_class(permission_manager)
+        with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+            with patch.object(
+                FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+            ):
+                if tool_class is Edit:
+                    result = await tool.call(
+                        mcp_context,
+                        file_path=test_file,
+                        old_string="line 51\n",
+                        new_string="changed line 51\n",
+                    )
+                else:
+                    result = await tool.call(
+                        mcp_context,
+                        file_path=test_file,
+                        edits=[
+                            {
+                                "old_string": "line 51\n",
+                                "new_string": "changed line 51\n",
+                            }
+                        ],
+                    )
+
+        # Three lines of context on each side of line 51
+        assert "@@ -48,7 +48,7 @@\n" in result
+        assert "-line 51\n+changed line 51\n" in result
+
 
 class TestDirectoryTreeTool:
     """Test the DirectoryTreeTool class."""
@@ -877,6 +1021,279 @@ class TestContentReplaceTool:
             assert "This line should stay the same." in content
             assert "More new content here that will be replaced." in content
 
+    @pytest.mark.asyncio
+    async def test_content_replace_file_path_with_extension_list(
+        self,
+        content_replace_tool: ContentReplaceTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that a file path matches an extension list file pattern."""
+        test_file_path = os.path.join(setup_allowed_path, "component.tsx")
+        with open(test_file_path, "w") as f:
+            f.write("const value = oldName;\n")
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+            with patch.object(
+                FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+            ):
+                result = await content_replace_tool.call(
+                    mcp_context,
+                    pattern="oldName",
+                    replacement="newName",
+                    path=test_file_path,
+                    file_pattern="*.{ts,tsx}",
+                    dry_run=False,
+                )
+
+        # Verify the file matched the pattern and was modified
+        assert "Made 1 replacements of 'oldName'" in result
+        with open(test_file_path, "r") as f:
+            assert f.read() == "const value = newName;\n"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mmap_threshold", [0, 64 * 1024 * 1024])
+    async def test_content_replace_writes_platform_newlines(
+        self,
+        content_replace_tool: ContentReplaceTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+        mmap_threshold: int,
+    ):
+        """Test that memory-mapped and in-memory rewrites use the same newlines."""
+        test_file_path = os.path.join(setup_allowed_path, "newlines.txt")
+        with open(test_file_path, "wb") as f:
+            f.write(b"first old\nsecond old\n")
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        # Write as a platform with CRLF line endings would
+        with patch("mcp_claude_code.tools.filesystem.base._LINE_SEPARATOR", b"\r\n"):
+            with patch(
+                "mcp_claude_code.tools.filesystem.content_replace._MMAP_THRESHOLD",
+                mmap_threshold,
+            ):
+                with patch.object(
+                    FilesystemBaseTool, "set_tool_context_info", AsyncMock()
+                ):
+                    with patch.object(
+                        FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                    ):
+                        await content_replace_tool.call(
+                            mcp_context,
+                            pattern="old",
+                            replacement="new",
+                            path=test_file_path,
+                            file_pattern="*",
+                            dry_run=False,
+                        )
+
+        with open(test_file_path, "rb") as f:
+            assert f.read() == b"first new\r\nsecond new\r\n"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("dry_run", [False, True])
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"old first\nsecond old\nthird\n",
+            b"old first\r\nsecond old\r\nthird\r\n",
+            b"xxold\r\nmixed\rold\nend\r",
+        ],
+    )
+    async def test_content_replace_mapped_file_matches_in_memory(
+        self,
+        content_replace_tool: ContentReplaceTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+        content: bytes,
+        dry_run: bool,
+    ):
+        """Test that memory-mapped and in-memory rewrites produce the same file."""
+        results = []
+        for name, mmap_threshold in (("mapped.txt", 0), ("in_memory.txt", 1 << 62)):
+            test_file_path = os.path.join(setup_allowed_path, name)
+            with open(test_file_path, "wb") as f:
+                f.write(content)
+
+            # Mock context calls
+            tool_ctx = AsyncMock()
+            tool_ctx.set_tool_info = AsyncMock()
+
+            # Use tiny chunks so matches and "\r\n" pairs straddle chunk boundaries
+            with patch(
+                "mcp_claude_code.tools.filesystem.content_replace._MMAP_THRESHOLD",
+                mmap_threshold,
+            ):
+                with patch(
+                    "mcp_claude_code.tools.filesystem.content_replace._MMAP_CHUNK_SIZE",
+                    4,
+                ):
+                    with patch.object(
+                        FilesystemBaseTool, "set_tool_context_info", AsyncMock()
+                    ):
+                        with patch.object(
+                            FilesystemBaseTool,
+                            "create_tool_context",
+                            return_value=tool_ctx,
+                        ):
+                            result = await content_replace_tool.call(
+                                mcp_context,
+                                pattern="old",
+                                replacement="new",
+                                path=test_file_path,
+                                file_pattern="*",
+                                dry_run=dry_run,
+                            )
+
+            if dry_run:
+                assert "Dry run: 2 replacements of 'old'" in result
+            else:
+                assert "Made 2 replacements of 'old'" in result
+            with open(test_file_path, "rb") as f:
+                results.append(f.read())
+
+        assert results[0] == results[1]
+        if dry_run:
+            assert results[0] == content
+        else:
+            assert b"old" not in results[0]
+        # No temporary files are left behind, and none are written on a dry run
+        assert sorted(os.listdir(setup_allowed_path)) == ["in_memory.txt", "mapped.txt"]
+
+    @pytest.mark.asyncio
+    async def test_content_replace_mapped_file_keeps_original_on_failure(
+        self,
+        content_replace_tool: ContentReplaceTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that a failed memory-mapped rewrite leaves the original file intact."""
+        test_file_path = os.path.join(setup_allowed_path, "failing.txt")
+        with open(test_file_path, "w") as f:
+            f.write("some old content\n")
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        # Lower the threshold so the small test file is memory-mapped
+        with patch(
+            "mcp_claude_code.tools.filesystem.content_replace._MMAP_THRESHOLD", 0
+        ):
+            with patch(
+                "mcp_claude_code.tools.filesystem.content_replace.os.replace",
+                side_effect=OSError("No space left on device"),
+            ):
+                with patch.object(
+                    FilesystemBaseTool, "set_tool_context_info", AsyncMock()
+                ):
+                    with patch.object(
+                        FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                    ):
+                        result = await content_replace_tool.call(
+                            mcp_context,
+                            pattern="old",
+                            replacement="new",
+                            path=test_file_path,
+                            file_pattern="*",
+                            dry_run=False,
+                        )
+
+        # The error is reported and the original file and directory are unchanged
+        assert "No occurrences of pattern 'old'" in result
+        assert "No space left on device" in tool_ctx.warning.call_args[0][0]
+        with open(test_file_path, "r") as f:
+            assert f.read() == "some old content\n"
+        assert os.listdir(setup_allowed_path) == ["failing.txt"]
+
+    @pytest.mark.asyncio
+    async def test_content_replace_mapped_file_through_symlink(
+        self,
+        content_replace_tool: ContentReplaceTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that a memory-mapped rewrite edits a symlink's target."""
+        target_dir = os.path.join(setup_allowed_path, "real")
+        os.makedirs(target_dir)
+        target_path = os.path.join(target_dir, "target.txt")
+        with open(target_path, "w") as f:
+            f.write("some old content\n")
+        link_path = os.path.join(setup_allowed_path, "link.txt")
+        os.symlink(target_path, link_path)
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        # Lower the threshold so the small test file is memory-mapped
+        with patch(
+            "mcp_claude_code.tools.filesystem.content_replace._MMAP_THRESHOLD", 0
+        ):
+            with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+                with patch.object(
+                    FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                ):
+                    result = await content_replace_tool.call(
+                        mcp_context,
+                        pattern="old",
+                        replacement="new",
+                        path=setup_allowed_path,
+                        file_pattern="link.txt",
+                        dry_run=False,
+                    )
+
+        # The link is kept and the target file is replaced
+        assert "Made 1 replacements of 'old'" in result
+        assert os.path.islink(link_path)
+        with open(target_path, "r") as f:
+            assert f.read() == "some new content\n"
+        assert os.listdir(target_dir) == ["target.txt"]
+
+    @pytest.mark.asyncio
+    async def test_content_replace_empty_pattern(
+        self,
+        content_replace_tool: ContentReplaceTool,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that an empty pattern is rejected before any file is scanned."""
+        test_file_path = os.path.join(setup_allowed_path, "empty_pattern.txt")
+        with open(test_file_path, "w") as f:
+            f.write("some content\n")
+
+        # Mock context calls
+        tool_ctx = AsyncMock()
+        tool_ctx.set_tool_info = AsyncMock()
+
+        # Lower the threshold so the file would take the memory-mapped path
+        with patch(
+            "mcp_claude_code.tools.filesystem.content_replace._MMAP_THRESHOLD", 0
+        ):
+            with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+                with patch.object(
+                    FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                ):
+                    result = await content_replace_tool.call(
+                        mcp_context,
+                        pattern="",
+                        replacement="new",
+                        path=test_file_path,
+                        file_pattern="*",
+                        dry_run=False,
+                    )
+
+        assert result == "Error: Parameter 'pattern' cannot be empty"
+        with open(test_file_path, "r") as f:
+            assert f.read() == "some content\n"
+
     @pytest.mark.asyncio
     async def test_content_replace_dry_run(
         self,
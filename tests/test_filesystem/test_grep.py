@@ -81,6 +81,154 @@ class TestGrep:
         assert "line two with other content" not in result
         assert test_file_path in result
 
+    @pytest.mark.asyncio
+    async def test_grep_anchored_pattern_fallback(
+        self,
+        grep_tool: Grep,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that ^ and $ anchor to each line in the fallback implementation."""
+        test_file_path = os.path.join(setup_allowed_path, "anchored.py")
+        with open(test_file_path, "w") as f:
+            f.write("import os\n")
+            f.write("def first():\n")
+            f.write("    def nested():\n")
+            f.write("def last():\n")
+
+        tool_ctx = AsyncMock()
+
+        with patch.object(Grep, "is_ripgrep_installed", return_value=False):
+            with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+                with patch.object(
+                    FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                ):
+                    result = await grep_tool.call(
+                        mcp_context,
+                        pattern="^def .*:$",
+                        path=test_file_path,
+                    )
+
+        assert "Found 2 matches" in result
+        assert f"{test_file_path}:2: def first():" in result
+        assert f"{test_file_path}:4: def last():" in result
+        assert "nested" not in result
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("pattern", [r"\Adef ", r":\n\Z"])
+    async def test_grep_text_anchors_match_per_line_fallback(
+        self,
+        grep_tool: Grep,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+        pattern: str,
+    ):
+        """Test that \\A and \\Z anchor to each line in the fallback implementation."""
+        test_file_path = os.path.join(setup_allowed_path, "text_anchors.py")
+        with open(test_file_path, "w") as f:
+            f.write("import os\n")
+            f.write("def first():\n")
+            f.write("    def nested():\n")
+            f.write("def last():\n")
+
+        tool_ctx = AsyncMock()
+
+        with patch.object(Grep, "is_ripgrep_installed", return_value=False):
+            with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+                with patch.object(
+                    FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                ):
+                    result = await grep_tool.call(
+                        mcp_context,
+                        pattern=pattern,
+                        path=test_file_path,
+                    )
+
+        assert f"{test_file_path}:2: def first():" in result
+        assert f"{test_file_path}:4: def last():" in result
+        assert "import os" not in result
+
+    @pytest.mark.asyncio
+    async def test_grep_large_file_streamed_fallback(
+        self,
+        grep_tool: Grep,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that files over the whole-file size limit are searched per line."""
+        test_file_path = os.path.join(setup_allowed_path, "large.py")
+        with open(test_file_path, "w") as f:
+            f.write("import os\n")
+            f.write("def first():\n")
+            f.write("    def nested():\n")
+            f.write("def last():\n")
+
+        tool_ctx = AsyncMock()
+
+        # Lower the limit so the small test file takes the streaming path
+        with patch("mcp_claude_code.tools.filesystem.grep._WHOLE_FILE_SEARCH_LIMIT", 0):
+            with patch.object(Grep, "is_ripgrep_installed", return_value=False):
+                with patch.object(
+                    FilesystemBaseTool, "set_tool_context_info", AsyncMock()
+                ):
+                    with patch.object(
+                        FilesystemBaseTool,
+                        "create_tool_context",
+                        return_value=tool_ctx,
+                    ):
+                        result = await grep_tool.call(
+                            mcp_context,
+                            pattern="^def .*:$",
+                            path=test_file_path,
+                        )
+
+        assert "Found 2 matches" in result
+        assert f"{test_file_path}:2: def first():" in result
+        assert f"{test_file_path}:4: def last():" in result
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("pattern", [r"\s+$", "= "])
+    async def test_grep_same_matches_for_small_and_large_files_fallback(
+        self,
+        grep_tool: Grep,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+        pattern: str,
+    ):
+        """Test that whole-file and streamed searches find the same lines."""
+        test_file_path = os.path.join(setup_allowed_path, "trailing.py")
+        with open(test_file_path, "w") as f:
+            f.write("x = 1\ny = 2   \n\nz = 3\n")
+
+        tool_ctx = AsyncMock()
+
+        results = []
+        for limit in (0, 4 * 1024 * 1024):
+            with patch(
+                "mcp_claude_code.tools.filesystem.grep._WHOLE_FILE_SEARCH_LIMIT", limit
+            ):
+                with patch.object(Grep, "is_ripgrep_installed", return_value=False):
+                    with patch.object(
+                        FilesystemBaseTool, "set_tool_context_info", AsyncMock()
+                    ):
+                        with patch.object(
+                            FilesystemBaseTool,
+                            "create_tool_context",
+                            return_value=tool_ctx,
+                        ):
+                            results.append(
+                                await grep_tool.call(
+                                    mcp_context,
+                                    pattern=pattern,
+                                    path=test_file_path,
+                                )
+                            )
+
+        assert results[0] == results[1]
+        if pattern == r"\s+$":
+            # Lines are searched with their newline, which \s+$ matches
+            assert "Found 4 matches" in results[0]
+
     @pytest.mark.asyncio
     async def test_grep_file_pattern_mismatch_fallback(
         self,
@@ -168,6 +316,67 @@ class TestGrep:
         assert "file2 with findable content" in result
         assert "different content" not in result
 
+    @pytest.mark.asyncio
+    async def test_grep_skips_excluded_directories_fallback(
+        self,
+        grep_tool: Grep,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that the fallback implementation does not search excluded directories."""
+        test_dir = os.path.join(setup_allowed_path, "grep_excluded")
+        excluded_dir = os.path.join(test_dir, "node_modules", "pkg")
+        os.makedirs(excluded_dir, exist_ok=True)
+
+        with open(os.path.join(test_dir, "main.js"), "w") as f:
+            f.write("const findable = 1;\n")
+        with open(os.path.join(excluded_dir, "index.js"), "w") as f:
+            f.write("const findable = 2;\n")
+
+        tool_ctx = AsyncMock()
+
+        with patch.object(Grep, "is_ripgrep_installed", return_value=False):
+            with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+                with patch.object(
+                    FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                ):
+                    result = await grep_tool.call(
+                        mcp_context, pattern="findable", path=test_dir
+                    )
+
+        assert "const findable = 1;" in result
+        assert "node_modules" not in result
+
+    @pytest.mark.asyncio
+    async def test_grep_skips_binary_files_fallback(
+        self,
+        grep_tool: Grep,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test that the fallback implementation skips files containing NUL bytes."""
+        test_dir = os.path.join(setup_allowed_path, "grep_binary")
+        os.makedirs(test_dir, exist_ok=True)
+
+        with open(os.path.join(test_dir, "text.txt"), "w") as f:
+            f.write("findable text\n")
+        with open(os.path.join(test_dir, "data.bin"), "wb") as f:
+            f.write(b"findable\x00binary\n")
+
+        tool_ctx = AsyncMock()
+
+        with patch.object(Grep, "is_ripgrep_installed", return_value=False):
+            with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+                with patch.object(
+                    FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                ):
+                    result = await grep_tool.call(
+                        mcp_context, pattern="findable", path=test_dir
+                    )
+
+        assert "findable text" in result
+        assert "data.bin" not in result
+
     @pytest.mark.asyncio
     async def test_grep_with_include_pattern_fallback(
         self,
@@ -212,6 +421,39 @@ class TestGrep:
         assert "file1 with findable content" not in result
         assert "file2 with findable content" in result
 
+    @pytest.mark.asyncio
+    async def test_grep_with_extension_list_fallback(
+        self,
+        grep_tool: Grep,
+        setup_allowed_path: str,
+        mcp_context: MagicMock,
+    ):
+        """Test grep with a brace-expanded include pattern using fallback."""
+        test_dir = os.path.join(setup_allowed_path, "grep_extension_list_dir")
+        os.makedirs(test_dir, exist_ok=True)
+
+        for name in ("app.ts", "view.tsx", "notes.txt"):
+            with open(os.path.join(test_dir, name), "w") as f:
+                f.write(f"findable in {name}\n")
+
+        tool_ctx = AsyncMock()
+
+        with patch.object(Grep, "is_ripgrep_installed", return_value=False):
+            with patch.object(FilesystemBaseTool, "set_tool_context_info", AsyncMock()):
+                with patch.object(
+                    FilesystemBaseTool, "create_tool_context", return_value=tool_ctx
+                ):
+                    result = await grep_tool.call(
+                        mcp_context,
+                        pattern="findable",
+                        path=test_dir,
+                        include="*.{ts,tsx}",
+                    )
+
+        assert "findable in app.ts" in result
+        assert "findable in view.tsx" in result
+        assert "notes.txt" not in result
+
     @pytest.mark.asyncio
     async def test_ripgrep_json_output_parsing(self, grep_tool: Grep):
         """Test parsing of ripgrep JSON output."""
@@ -243,6 +485,20 @@ class TestGrep:
         result = grep_tool.parse_ripgrep_json_output("")
         assert "No matches found" in result
 
+    @pytest.mark.asyncio
+    async def test_ripgrep_json_long_line_truncated(self, grep_tool: Grep):
+        """Test that very long matched lines are truncated."""
+        long_line = "x" * 600 + "match"
+        sample_output = (
+            '{"type":"match","data":{"path":{"text":"/path/to/min.js"},'
+            f'"lines":{{"text":"{long_line}"}},"line_number":1}}}}\n'
+        )
+
+        result = grep_tool.parse_ripgrep_json_output(sample_output)
+
+        assert "Found 1 matches in 1 file" in result
+        assert f"/path/to/min.js:1: {'x' * 500} [... 105 more characters]" in result
+
     @pytest.mark.asyncio
     async def test_ripgrep_integration(
         self,
@@ -242,3 +242,38 @@ line 4"""
             multi_edit_tool.permission_manager.is_path_allowed = (
                 original_is_path_allowed
             )
+
+    @pytest.mark.asyncio
+    async def test_edits_that_cancel_out(self, multi_edit_tool, mock_ctx, tmp_path):
+        """Test that edits undoing each other leave the file untouched."""
+        # Create a test file
+        test_file = tmp_path / "test.txt"
+        test_content = "line 1\nline 2"
+        test_file.write_text(test_content)
+        mtime = test_file.stat().st_mtime_ns
+
+        # Temporarily patch the permission manager to allow the temp path
+        original_is_path_allowed = multi_edit_tool.permission_manager.is_path_allowed
+        multi_edit_tool.permission_manager.is_path_allowed = (
+            lambda path: str(tmp_path) in path
+        )
+
+        try:
+            result = await multi_edit_tool.call(
+                mock_ctx,
+                file_path=str(test_file),
+                edits=[
+                    {"old_string": "line 1", "new_string": "temporary"},
+                    {"old_string": "temporary", "new_string": "line 1"},
+                ],
+            )
+
+            # Check that nothing was written
+            assert result == f"No changes made to file: {test_file}"
+            assert test_file.read_text() == test_content
+            assert test_file.stat().st_mtime_ns == mtime
+        finally:
+            # Restore the original permission manager
+            multi_edit_tool.permission_manager.is_path_allowed = (
+                original_is_path_allowed
+            )
@@ -232,3 +232,64 @@ class TestProjectSystemPrompts:
                 assert "System prompt for my-project" in registered_prompts
                 assert "System prompt for parent" not in registered_prompts
                 assert "System prompt for child" not in registered_prompts
+
+    def test_project_system_prompt_picks_up_git_changes(self):
+        """Test that the rendered prompt is not cached past its git information."""
+        mock_server = Mock()
+        registered_prompts = {}
+
+        def mock_prompt(name: str, description: str = None):
+            def decorator(func):
+                registered_prompts[name] = func
+                return func
+
+            return decorator
+
+        mock_server.prompt = mock_prompt
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = os.path.join(temp_dir, "changing-project")
+            os.makedirs(project_path)
+
+            with (
+                patch("mcp_claude_code.prompts.get_os_info") as mock_os_info,
+                patch("mcp_claude_code.prompts.get_directory_structure"),
+                patch("mcp_claude_code.prompts.get_git_info") as mock_git_info,
+            ):
+                mock_os_info.return_value = ("Darwin", "", "24.5.0")
+                mock_git_info.side_effect = [
+                    {"current_branch": "first-branch"},
+                    {"current_branch": "second-branch"},
+                ]
+
+                register_all_prompts(mock_server, [project_path])
+
+                prompt_func = registered_prompts["System prompt for changing-project"]
+                assert "first-branch" in prompt_func()
+                assert "second-branch" in prompt_func()
+
+    def test_register_all_prompts_twice_does_not_duplicate(self):
+        """Test that re-registering prompts on a server only adds new projects."""
+        mock_server = Mock()
+        registration_counts: dict[str, int] = {}
+
+        def mock_prompt(name: str, description: str = None):
+            def decorator(func):
+                registration_counts[name] = registration_counts.get(name, 0) + 1
+                return func
+
+            return decorator
+
+        mock_server.prompt = mock_prompt
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project1_path = os.path.join(temp_dir, "project1")
+            project2_path = os.path.join(temp_dir, "project2")
+
+            register_all_prompts(mock_server, [project1_path])
+            register_all_prompts(mock_server, [project1_path, project2_path])
+
+        # Every prompt should have been registered exactly once
+        assert registration_counts["Compact current conversation"] == 1
+        assert registration_counts["System prompt for project1"] == 1
+        assert registration_counts["System prompt for project2"] == 1
@@ -82,6 +82,25 @@ class TestClaudeCodeServer:
             # Verify tools were registered
             mock_register.assert_called_once()
 
+    def test_allowed_paths_registered_once(self) -> None:
+        """Test that already registered allowed paths are skipped."""
+        mock_mcp = MagicMock()
+        server = ClaudeCodeServer(
+            name="test-server",
+            mcp_instance=mock_mcp,
+            allowed_paths=["/test/path1", "/test/path1"],
+        )
+
+        # Replace permission_manager with mock after initial registration
+        server.permission_manager = MagicMock()
+
+        # Paths registered by the constructor must not be added again
+        server._add_allowed_paths(["/test/path1", "/test/path2"])
+
+        server.permission_manager.add_allowed_path.assert_called_once_with(
+            "/test/path2"
+        )
+
     @pytest.mark.skip(reason="Cannot run stdio server in a test environment")
     def test_run(self, server: tuple[ClaudeCodeServer, MagicMock]) -> None:
         """Test running the server."""